@@ -0,0 +1,107 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+REPLACEMENT_CHAR = 0xFFFD
+
+
+@dataclass
+class Glyph:
+    codepoint: int
+    device_width: int
+    width: int
+    height: int
+    x_offset: int
+    y_offset: int
+    bitmap: np.ndarray
+
+
+@dataclass
+class BDFFont:
+    """Pure python parse of a BDF font, laid out the same way as rgbmatrix's Font"""
+
+    path: str
+    height: int = 0
+    baseline: int = 0
+    ascent: int = 0
+    descent: int = 0
+    default_char: int = None
+    glyphs: dict[int, Glyph] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str) -> "BDFFont":
+        font = cls(path)
+        with open(path, "r", encoding="latin-1") as f:
+            font._parse(f)
+        return font
+
+    def _parse(self, lines):
+        codepoint = None
+        device_width = 0
+        bbx = (0, 0, 0, 0)
+        rows: list[int] = None
+
+        for line in lines:
+            parts = line.split()
+            if not parts:
+                continue
+
+            keyword = parts[0]
+            if rows is not None:
+                if keyword == "ENDCHAR":
+                    self._add_glyph(codepoint, device_width, bbx, rows)
+                    rows = None
+                else:
+                    rows.append(int(parts[0], 16))
+            elif keyword == "FONTBOUNDINGBOX":
+                _, height, _, y_offset = (int(p) for p in parts[1:5])
+                self.height = height
+                self.baseline = height + y_offset
+            elif keyword == "FONT_ASCENT":
+                self.ascent = int(parts[1])
+            elif keyword == "FONT_DESCENT":
+                self.descent = int(parts[1])
+            elif keyword == "DEFAULT_CHAR":
+                self.default_char = int(parts[1])
+            elif keyword == "ENCODING":
+                codepoint = int(parts[1])
+            elif keyword == "DWIDTH":
+                device_width = int(parts[1])
+            elif keyword == "BBX":
+                bbx = tuple(int(p) for p in parts[1:5])
+            elif keyword == "BITMAP":
+                rows = []
+
+    def _add_glyph(self, codepoint, device_width, bbx, rows: list[int]):
+        if codepoint is None or codepoint < 0:
+            return
+
+        width, height, x_offset, y_offset = bbx
+        # each row is padded out to a whole number of bytes, MSB first
+        row_bits = max(1, (width + 7) // 8) * 8
+        shifts = np.arange(row_bits - 1, row_bits - 1 - width, -1)
+        bits = (np.array(rows, dtype=np.uint32)[:, None] >> shifts) & 1
+        bitmap = bits.astype(bool).reshape((len(rows), width))
+
+        self.glyphs[codepoint] = Glyph(
+            codepoint=codepoint,
+            device_width=device_width,
+            width=width,
+            height=height,
+            x_offset=x_offset,
+            y_offset=y_offset,
+            bitmap=bitmap,
+        )
+
+    def find_glyph(self, codepoint: int) -> Glyph:
+        glyph = self.glyphs.get(codepoint)
+        if glyph is None:
+            # same fallback as rgbmatrix, the unicode replacement character
+            glyph = self.glyphs.get(REPLACEMENT_CHAR)
+        return glyph
+
+    def character_width(self, codepoint: int) -> int:
+        glyph = self.glyphs.get(codepoint)
+        if glyph is None:
+            return -1
+        return glyph.device_width
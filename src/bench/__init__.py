@@ -0,0 +1,23 @@
+"""Rendering benchmarks that run every view against the headless matrix.
+
+Run from the src folder so the relative font and image paths resolve:
+
+    python -m bench --frames 500 --json before.json
+    python -m bench --frames 500 --baseline before.json
+
+Recordings made with RECORDING_PATH set can be replayed through the views at
+full speed, on the recorded clock, with the frames diffed against the panel:
+
+    python -m bench.replay game-night.rec --record baseline.rec
+    python -m bench.replay baseline.rec --fail-on-diff
+
+Every view can be recorded live on the render thread and replayed straight
+away, which fails if a recording doesn't replay to exactly what was drawn:
+
+    python -m bench.roundtrip --seconds 1
+
+Game of Life stepping is benchmarked on its own, in generations per second
+for each grid size with the dense engine and the striped one per worker count:
+
+    python -m bench.life --sizes 256,1024,2048 --workers 1,2,4
+"""
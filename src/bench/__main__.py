@@ -0,0 +1,101 @@
+import headless
+
+headless.install()
+
+import argparse
+import asyncio
+import json
+import sys
+
+from constants import PANEL_HEIGHT, PANEL_WIDTH
+from rgbmatrix import RGBMatrix, RGBMatrixOptions
+
+from bench.payloads import scenarios
+from bench.runner import Result, run_scenario
+from data import Data
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m bench", description="Benchmark view rendering"
+    )
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument(
+        "--alloc-frames",
+        type=int,
+        default=30,
+        help="frames to trace allocations over (0 to skip)",
+    )
+    parser.add_argument(
+        "--only", default="", help="comma separated scenario or view names"
+    )
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json file")
+    return parser.parse_args(argv)
+
+
+def init_matrix() -> RGBMatrix:
+    options = RGBMatrixOptions()
+    options.rows = PANEL_HEIGHT
+    options.cols = PANEL_WIDTH
+    options.chain_length = 2
+    return RGBMatrix(options=options)
+
+
+def _delta(value: float, old: float) -> str:
+    if not old:
+        return ""
+    return f" ({(value - old) / old * 100:+.0f}%)"
+
+
+def print_results(results: list[Result], baseline: dict[str, dict] = None):
+    baseline = baseline or {}
+    header = f"{'scenario':<22}{'fps':>18}{'p50 ms':>18}{'p99 ms':>18}{'KiB/frame':>18}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        old = baseline.get(r.name, {})
+        fps = f"{r.fps:.0f}{_delta(r.fps, old.get('fps'))}"
+        p50 = f"{r.p50_ms:.3f}{_delta(r.p50_ms, old.get('p50_ms'))}"
+        p99 = f"{r.p99_ms:.3f}{_delta(r.p99_ms, old.get('p99_ms'))}"
+        alloc = f"{r.alloc_kib:.1f}{_delta(r.alloc_kib, old.get('alloc_kib'))}"
+        print(f"{r.name:<22}{fps:>18}{p50:>18}{p99:>18}{alloc:>18}")
+
+
+async def run(args: argparse.Namespace) -> list[Result]:
+    matrix = init_matrix()
+    data = Data(listen=False)
+
+    only = {name.strip() for name in args.only.split(",") if name.strip()}
+    results = []
+    for scenario in scenarios():
+        if only and scenario.name not in only and scenario.view not in only:
+            continue
+
+        result = await run_scenario(
+            matrix, data, scenario, args.frames, args.warmup, args.alloc_frames
+        )
+        results.append(result)
+
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = {r["name"]: r for r in json.load(f)}
+
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([r.as_dict() for r in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
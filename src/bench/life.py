@@ -0,0 +1,74 @@
+import headless
+
+headless.install()
+
+import argparse
+import json
+import sys
+from time import perf_counter
+
+import numpy as np
+
+from life import DenseEngine, StripedEngine
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.life",
+        description="Benchmark Game of Life stepping against grid size and workers",
+    )
+    parser.add_argument(
+        "--sizes", default="128,256,512,1024,2048", help="square grid sizes"
+    )
+    parser.add_argument(
+        "--workers", default="1,2,3,4", help="striped engine worker counts"
+    )
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--json", help="write the results to this file")
+    return parser.parse_args(argv)
+
+
+def _ints(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def gens_per_sec(engine, generations: int) -> float:
+    rng = np.random.default_rng(0)
+    engine.add(rng.random((engine.height, engine.width)) >= 0.5)
+    engine.step()  # warm up
+    start = perf_counter()
+    engine.step(generations)
+    elapsed = perf_counter() - start
+    engine.close()
+    return generations / elapsed if elapsed else float("inf")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+
+    header = f"{'size':>8}{'engine':>12}{'stripes':>10}{'gens/sec':>14}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    for size in _ints(args.sizes):
+        dense = gens_per_sec(DenseEngine(size, size), args.generations)
+        print(f"{size:>8}{'dense':>12}{1:>10}{dense:>14.1f}{1.0:>10.2f}")
+        results.append({"size": size, "engine": "dense", "workers": 1, "gps": dense})
+        for workers in _ints(args.workers):
+            engine = StripedEngine(size, size, workers=workers)
+            stripes = engine.workers
+            gps = gens_per_sec(engine, args.generations)
+            print(
+                f"{size:>8}{'striped':>12}{stripes:>10}{gps:>14.1f}{gps / dense:>10.2f}"
+            )
+            results.append(
+                {"size": size, "engine": "striped", "workers": stripes, "gps": gps}
+            )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
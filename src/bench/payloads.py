@@ -0,0 +1,250 @@
+"""Canned Data payloads, shaped like the MQTT messages Home Assistant sends"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+from constants import (
+    ALERT,
+    ALLGAMES,
+    BUFFER_FRAMES,
+    CHUNK,
+    DAILY,
+    DASHBOARD,
+    FLAPPYBIRD,
+    GAMEOFLIFE,
+    HOURLY,
+    LOGO_SIZE,
+    LOGO_URL,
+    MUSIC,
+    OFF,
+    SCOREBOARD,
+    WEATEHR,
+)
+from data import Data
+from view import VIEWS
+
+
+@dataclass
+class Scenario:
+    name: str
+    view: str
+    setup: Callable[[Data], None] = None
+
+
+def _forecasts(start: datetime, step: timedelta, count: int) -> list[dict]:
+    conditions = ["sunny", "partlycloudy", "rainy", "cloudy", "snowy", "windy"]
+    forecasts = []
+    for i in range(count):
+        forecasts.append(
+            {
+                "datetime": (start + step * i).isoformat(),
+                "condition": conditions[i % len(conditions)],
+                "temperature": 70 + i,
+                "templow": 50 + i,
+                "humidity": 40 + i,
+                "precipitation_probability": 10 * i,
+            }
+        )
+    return forecasts
+
+
+def weather_payload(alerts: int = 0) -> dict:
+    now = datetime(2024, 10, 1, 12, 0, 0)
+    alert = {"total": alerts}
+    if alerts:
+        alert.update(
+            {
+                "title": "Severe Thunderstorm Warning issued for the area",
+                "event_expires": (now + timedelta(hours=3)).isoformat(),
+                "selected": 1,
+                "spoken_desc": "At noon, a severe thunderstorm was located near "
+                "town, moving east at 30 miles per hour. Hazards include 60 mph "
+                "wind gusts and quarter size hail.",
+            }
+        )
+
+    return {
+        "condition": "partlycloudy",
+        "temperature": 72,
+        "temperature_unit": "°F",
+        "humidity": 45,
+        "cloud_coverage": 40,
+        "pressure": 30.12,
+        "pressure_unit": "inHg",
+        "wind_bearing": 225.0,
+        "wind_speed": 9.2,
+        "wind_speed_unit": "mph",
+        "alert": alert,
+        "forecast_daily": _forecasts(now, timedelta(days=1), 7),
+        "forecast_hourly": _forecasts(now, timedelta(hours=1), 12),
+    }
+
+
+def averages_payload(points: int = 20) -> dict:
+    hours = np.arange(points)
+    return {
+        "temperature": list(np.round(70 + 3 * np.sin(hours / 4), 1)),
+        "humidity": list(np.round(45 + 5 * np.cos(hours / 5), 1)),
+        "voc": list(100 + (hours * 7) % 40),
+        "co2": list(600 + (hours * 37) % 300),
+    }
+
+
+def _logo_url(league: str, abbr: str) -> str:
+    return f"{LOGO_URL}/{league}/500-dark/scoreboard/{abbr}.png".lower()
+
+
+def _cache_logos(*urls):
+    # avoid hitting the network from the benchmark
+    scoreboard = VIEWS[SCOREBOARD]
+    for url in urls:
+        scoreboard.cached_logos[url.lower()] = Image.new("RGB", (LOGO_SIZE, LOGO_SIZE))
+
+
+def baseball_game() -> dict:
+    _cache_logos(_logo_url("mlb", "PIT"), _logo_url("mlb", "CHC"))
+    return {
+        "state": "IN",
+        "sport": "baseball",
+        "league": "mlb",
+        "team_abbr": "PIT",
+        "opponent_abbr": "CHC",
+        "team_homeaway": "home",
+        "opponent_homeaway": "away",
+        "clock": "Top 7th",
+        "team_score": 4,
+        "opponent_score": 3,
+        "on_first": True,
+        "on_third": True,
+        "outs": 2,
+        "balls": 3,
+        "strikes": 1,
+        "last_play": "Swinging strike, foul tip into the mitt of the catcher.",
+    }
+
+
+def football_game() -> dict:
+    _cache_logos(_logo_url("nfl", "PIT"), _logo_url("nfl", "CLE"))
+    return {
+        "state": "IN",
+        "sport": "football",
+        "league": "nfl",
+        "team_abbr": "PIT",
+        "opponent_abbr": "CLE",
+        "team_id": "23",
+        "possession": "23",
+        "team_homeaway": "home",
+        "opponent_homeaway": "away",
+        "clock": "Q3 - 8:21",
+        "team_score": 17,
+        "opponent_score": 10,
+        "team_timeouts": 2,
+        "opponent_timeouts": 3,
+        "down_distance_text": "3rd and 4 at CLE 38",
+        "last_play": "Pass short right complete for 6 yards.",
+    }
+
+
+def pre_game() -> dict:
+    _cache_logos(_logo_url("nhl", "PIT"), _logo_url("nhl", "PHI"))
+    return {
+        "state": "PRE",
+        "sport": "hockey",
+        "league": "nhl",
+        "team_abbr": "PIT",
+        "opponent_abbr": "PHI",
+        "team_homeaway": "home",
+        "opponent_homeaway": "away",
+        "clock": "Sat, 7:00 PM EDT",
+        "team_record": "12-8-3",
+        "opponent_record": "10-11-2",
+    }
+
+
+def all_games_payload(count: int = 9) -> dict:
+    leagues = ["NHL", "NFL", "MLB"]
+    states = ["IN", "PRE", "POST"]
+    games = {}
+    for i in range(count):
+        games[f"game_{i}"] = {
+            "league": leagues[i % len(leagues)],
+            "state": states[i % len(states)],
+            "clock": "Q2 - 5:43 - EDT",
+            "away_abbr": f"A{i}",
+            "away_score": i,
+            "away_colors": ["#FFB612", "#101820"],
+            "home_abbr": f"H{i}",
+            "home_score": i + 2,
+            "home_colors": ["#C8102E", "#FFFFFF"],
+        }
+
+    return {"league_filter": "All", "state_filter": "All", "games": games}
+
+
+def _weather(forecast_type: str, alerts: int = 0):
+    def setup(data: Data):
+        data.weather_forecast = weather_payload(alerts)
+        data.forecast_type = forecast_type
+
+    return setup
+
+
+def _scoreboard(game: Callable[[], dict]):
+    def setup(data: Data):
+        data.selected_game = game()
+
+    return setup
+
+
+def _dashboard(data: Data):
+    data.averages = averages_payload()
+    data.temperature = 22.4
+    data.humidity = 44.5
+    data.voc = 103
+    data.co2 = 650
+
+
+def _all_games(data: Data):
+    data.all_games = all_games_payload()
+
+
+def _music(data: Data):
+    rng = np.random.default_rng(0)
+    data.title = "A title long enough that it has to scroll"
+    data._artists = ["Somebody", "Somebody Else"]
+    data.album_art = Image.new("RGB", (64, 64), (120, 40, 200))
+    data.album_art_colors = [(120, 40, 200), (200, 200, 60), (40, 160, 160)]
+    data.eq_stream.frame_buffer = rng.integers(
+        -8000, 8000, size=(BUFFER_FRAMES, CHUNK), dtype=np.int16
+    )
+
+
+def _flappy_bird(data: Data):
+    data.put_command("flappy_bird_commands", "FLAP")
+
+
+SCENARIOS: list[Scenario] = [
+    Scenario("Off", OFF),
+    Scenario("Weather Daily", WEATEHR, _weather(DAILY)),
+    Scenario("Weather Hourly", WEATEHR, _weather(HOURLY)),
+    Scenario("Weather Alert", WEATEHR, _weather(ALERT, alerts=2)),
+    Scenario("Dashboard", DASHBOARD, _dashboard),
+    Scenario("All Games", ALLGAMES, _all_games),
+    Scenario("Scoreboard Baseball", SCOREBOARD, _scoreboard(baseball_game)),
+    Scenario("Scoreboard Football", SCOREBOARD, _scoreboard(football_game)),
+    Scenario("Scoreboard Pre", SCOREBOARD, _scoreboard(pre_game)),
+    Scenario("Music", MUSIC, _music),
+    Scenario("Game of Life", GAMEOFLIFE),
+    Scenario("Flappy Bird", FLAPPYBIRD, _flappy_bird),
+]
+
+
+def scenarios() -> list[Scenario]:
+    """Every canned scenario, plus a bare one for any view without a payload"""
+    covered = {s.view for s in SCENARIOS}
+    extra = [Scenario(name, name) for name in VIEWS if name not in covered]
+    return SCENARIOS + extra
@@ -0,0 +1,262 @@
+import headless
+
+headless.install()
+
+import time
+
+_real_perf_counter = time.perf_counter
+
+
+class VirtualClock(object):
+    """Stands in for a clock so views animate on the recorded time"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+CLOCK = VirtualClock()
+WALL_CLOCK = VirtualClock()
+# has to be in place before the views do `from time import perf_counter`
+time.perf_counter = CLOCK
+time.time = WALL_CLOCK
+
+import argparse
+import asyncio
+from dataclasses import asdict, dataclass, field
+import json
+import sys
+
+import numpy as np
+
+from constants import GAMEOFLIFE
+from data import Data
+from framebuffer import FrameBuffer
+from recording import (
+    COMMAND,
+    COMMAND_QUEUES,
+    EQ_FRAME_BUFFER,
+    FRAME,
+    MESSAGE,
+    STATE,
+    Recorder,
+    read_recording,
+)
+
+
+@dataclass
+class ReplayResult:
+    view: str
+    frames: int = 0
+    errors: int = 0
+    diff_frames: int = 0
+    max_diff_pixels: int = 0
+    recorded_draw_times: list[float] = field(default_factory=list, repr=False)
+    draw_times: list[float] = field(default_factory=list, repr=False)
+
+    def _p(self, times: list[float], percent: float) -> float:
+        return float(np.percentile(times, percent)) * 1000.0 if times else 0.0
+
+    @property
+    def recorded_p50_ms(self) -> float:
+        return self._p(self.recorded_draw_times, 50)
+
+    @property
+    def p50_ms(self) -> float:
+        return self._p(self.draw_times, 50)
+
+    @property
+    def p99_ms(self) -> float:
+        return self._p(self.draw_times, 99)
+
+    def as_dict(self) -> dict:
+        result = asdict(self)
+        del result["recorded_draw_times"]
+        del result["draw_times"]
+        result["recorded_p50_ms"] = self.recorded_p50_ms
+        result["p50_ms"] = self.p50_ms
+        result["p99_ms"] = self.p99_ms
+        return result
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.replay",
+        description="Replay a recording through the views and diff the frames",
+    )
+    parser.add_argument("recording", help="file written with RECORDING_PATH set")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument(
+        "--record",
+        help="write the replayed frames as a new recording, replaying that one "
+        "after a change shows exactly which frames the change altered",
+    )
+    parser.add_argument(
+        "--fail-on-diff",
+        action="store_true",
+        help="exit non zero if any frame differs from the recording",
+    )
+    return parser.parse_args(argv)
+
+
+def seed_random(seed: int = 0) -> None:
+    """Make the random grids and levels the same on every replay"""
+    np.random.seed(seed)
+    default_rng = np.random.default_rng
+    np.random.default_rng = lambda s=None: default_rng(seed if s is None else s)
+
+
+def apply_changes(data: Data, changes: dict) -> None:
+    for name, value in changes.items():
+        if name == EQ_FRAME_BUFFER:
+            data.eq_stream.frame_buffer = value
+        else:
+            setattr(data, name, value)
+
+
+def hand_commands(
+    data: Data, commands: dict[str, list[str]], handed: dict[str, int], taken: dict
+) -> None:
+    """Queue the recorded commands the views had taken by the end of a frame"""
+    for name, count in taken.items():
+        while handed[name] < count:
+            data.put_command(name, commands[name][handed[name]])
+            handed[name] += 1
+
+
+async def replay(
+    path: str, record_path: str = None
+) -> tuple[dict[str, ReplayResult], int]:
+    records = read_recording(path)
+    header = next(records)
+    width, height = header["width"], header["height"]
+    CLOCK.now = header["time"]
+    seed_random()
+    # the views start their timers and seed their state when they're created,
+    # so only import them once the clock and random are set up
+    from view import VIEWS, View
+
+    # a worker thread would step Game of Life on the wall clock, the
+    # generations one published while recording are drawn instead
+    VIEWS[GAMEOFLIFE].use_worker = False
+
+    recorder = None
+    if record_path:
+        recorder = Recorder(record_path, width, height)
+
+    data = Data(listen=False)
+    data.recorder = recorder
+    frame = FrameBuffer(width, height)
+    expected = np.zeros((height, width, 3), dtype=np.uint8)
+
+    results: dict[str, ReplayResult] = {}
+    messages = 0
+    # every command in the recording so far, and how many went on the queues
+    commands: dict[str, list[str]] = {name: [] for name in COMMAND_QUEUES}
+    handed = dict.fromkeys(COMMAND_QUEUES, 0)
+    current_view: View = None
+    for record in records:
+        CLOCK.now = record["time"]
+        if record["type"] == MESSAGE:
+            messages += 1
+            if recorder is not None:
+                recorder.message(record["topic"], record["payload"])
+            continue
+        if record["type"] == COMMAND:
+            commands[record["queue"]].append(record["command"])
+            continue
+        if record["type"] not in (STATE, FRAME):
+            continue
+
+        view = VIEWS[record["view"]]
+        if current_view is not view:
+            if current_view is not None:
+                current_view.unload()
+            view.load()
+            current_view = view
+
+        if record["type"] == STATE:
+            # written after the view loaded, before the frame it loaded for
+            view.set_state(record["state"])
+            if recorder is not None:
+                recorder.view_state(record["view"], record["state"])
+            continue
+
+        apply_changes(data, record["changes"])
+        WALL_CLOCK.now = record["wall"]
+        # one queued while the frame was drawn wasn't seen until the next
+        hand_commands(data, commands, handed, record["taken"])
+        if "input" in record:
+            view.set_input(record["input"])
+
+        name = record["view"]
+        if name not in results:
+            results[name] = ReplayResult(name)
+        result = results[name]
+
+        frame.Clear()
+        start = _real_perf_counter()
+        try:
+            await view.draw(frame, data)
+        except Exception:
+            # the live loop carries on past a failed draw, so does the replay
+            result.errors += 1
+        draw_time = _real_perf_counter() - start
+
+        if recorder is not None:
+            recorder.frame(
+                data,
+                record["view"],
+                frame.pixels,
+                CLOCK.now,
+                draw_time,
+                view.get_input(),
+            )
+
+        np.bitwise_xor(expected, record["delta"], out=expected)
+        diff_pixels = int(np.count_nonzero((frame.pixels != expected).any(axis=2)))
+
+        result.frames += 1
+        result.recorded_draw_times.append(record["draw_time"])
+        result.draw_times.append(draw_time)
+        if diff_pixels:
+            result.diff_frames += 1
+            result.max_diff_pixels = max(result.max_diff_pixels, diff_pixels)
+
+    if recorder is not None:
+        recorder.close()
+    return results, messages
+
+
+def print_results(results: dict[str, ReplayResult], messages: int):
+    header = (
+        f"{'view':<16}{'frames':>8}{'rec p50 ms':>12}{'p50 ms':>10}{'p99 ms':>10}"
+        f"{'errors':>8}{'diff frames':>13}{'max diff px':>13}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results.values():
+        print(
+            f"{r.view:<16}{r.frames:>8}{r.recorded_p50_ms:>12.3f}{r.p50_ms:>10.3f}"
+            f"{r.p99_ms:>10.3f}{r.errors:>8}{r.diff_frames:>13}{r.max_diff_pixels:>13}"
+        )
+    print(f"{messages} MQTT messages in the recording")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results, messages = asyncio.run(replay(args.recording, args.record))
+    print_results(results, messages)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([r.as_dict() for r in results.values()], f, indent=2)
+
+    if args.fail_on_diff and any(r.diff_frames for r in results.values()):
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
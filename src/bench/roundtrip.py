@@ -0,0 +1,82 @@
+import headless
+
+headless.install()
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench.__main__ import init_matrix
+from bench.payloads import baseball_game, football_game, pre_game, scenarios
+from data import Data
+from recording import Recorder
+from renderthread import RenderThread
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.roundtrip",
+        description="Record every view live on the render thread, then check "
+        "the recording replays to the same frames",
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=0.5, help="time to record each scenario"
+    )
+    parser.add_argument(
+        "--only", default="", help="comma separated scenario or view names"
+    )
+    parser.add_argument("--keep", help="write the recording here and keep it")
+    return parser.parse_args(argv)
+
+
+def record(path: str, seconds: float, only: set[str]) -> None:
+    # the canned games put their logos straight into the view's cache, do
+    # it before it loads so it's recorded with them like it'd be downloaded
+    for game in (baseball_game, football_game, pre_game):
+        game()
+
+    matrix = init_matrix()
+    data = Data(listen=False)
+    data.recorder = Recorder(path, matrix.width, matrix.height)
+
+    render = RenderThread(matrix, data)
+    for scenario in scenarios():
+        if only and scenario.name not in only and scenario.view not in only:
+            continue
+
+        if scenario.setup is not None:
+            scenario.setup(data)
+        data.view = scenario.view
+        if not render.is_alive():
+            render.start()
+        time.sleep(seconds)
+
+    data.is_running = False
+    render.join()
+    data.recorder.close()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    only = {name.strip() for name in args.only.split(",") if name.strip()}
+
+    path = args.keep
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".rec")
+        os.close(fd)
+    try:
+        record(path, args.seconds, only)
+        # the replay has to be a process of its own, it swaps perf_counter for
+        # the recorded clock before anything imports it
+        replay = [sys.executable, "-m", "bench.replay", path, "--fail-on-diff"]
+        return subprocess.call(replay)
+    finally:
+        if args.keep is None:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+from dataclasses import asdict, dataclass
+import gc
+from time import perf_counter
+import tracemalloc
+
+import numpy as np
+
+from bench.payloads import Scenario
+from data import Data
+from framebuffer import FrameBuffer
+from view import VIEWS, View
+
+
+@dataclass
+class Result:
+    name: str
+    view: str
+    frames: int
+    fps: float
+    p50_ms: float
+    p99_ms: float
+    alloc_kib: float
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+async def _frame(view: View, frame: FrameBuffer, canvas, matrix, data: Data):
+    frame.Clear()
+    start = perf_counter()
+    await view.draw(frame, data)
+    draw_time = perf_counter() - start
+    frame.upload(canvas)
+    return matrix.SwapOnVSync(canvas), draw_time
+
+
+async def run_scenario(
+    matrix, data: Data, scenario: Scenario, frames: int, warmup: int, alloc_frames: int
+) -> Result:
+    view = VIEWS[scenario.view]
+    data.view = scenario.view
+    if scenario.setup is not None:
+        scenario.setup(data)
+
+    canvas = matrix.CreateFrameCanvas()
+    frame = FrameBuffer(matrix.width, matrix.height)
+    view.load()
+
+    for _ in range(warmup):
+        canvas, _ = await _frame(view, frame, canvas, matrix, data)
+
+    gc.collect()
+    draw_times = np.zeros(frames)
+    start = perf_counter()
+    for i in range(frames):
+        canvas, draw_times[i] = await _frame(view, frame, canvas, matrix, data)
+    elapsed = perf_counter() - start
+
+    # tracemalloc slows everything down, so measure allocations in its own pass
+    peaks = np.zeros(alloc_frames)
+    tracemalloc.start()
+    for i in range(alloc_frames):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        canvas, _ = await _frame(view, frame, canvas, matrix, data)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks[i] = peak - baseline
+    tracemalloc.stop()
+
+    view.unload()
+
+    return Result(
+        name=scenario.name,
+        view=scenario.view,
+        frames=frames,
+        fps=frames / elapsed if elapsed else float("inf"),
+        p50_ms=float(np.percentile(draw_times, 50) * 1000),
+        p99_ms=float(np.percentile(draw_times, 99) * 1000),
+        alloc_kib=float(peaks.mean() / 1024) if alloc_frames else 0.0,
+    )
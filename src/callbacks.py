@@ -3,15 +3,23 @@ import logging
 from typing import TypedDict, Dict
 
 from constants import (
+    CONWAY,
+    CYCLE_ACTIONS,
     DAILY,
+    DENSE,
     FORECAST_TYPE,
     INFO_PAYLOAD_LEN,
+    KEEP_RUNNING,
+    LIFE_ENGINES,
+    RANDOM_PATTERN,
+    RULES,
     SECONDARY_DEFAULT,
     SECONDARY_TYPE,
 )
 
 # from customdiscoverable import Select
 from data import Data
+from life import pattern_library
 from mqttdevice import Discoverable
 from paho.mqtt.client import Client, MQTTMessage
 
@@ -23,8 +31,11 @@ class _UserData(TypedDict):
     entities: Dict[str, Discoverable]
 
 
-def _process_message(message: MQTTMessage, is_json: bool = False):
+def _process_message(user_data: _UserData, message: MQTTMessage, is_json: bool = False):
     payload = str(message.payload.decode("UTF-8"))
+    recorder = user_data["data"].recorder
+    if recorder is not None:
+        recorder.message(message.topic, payload)
 
     log = f"MQTT Message: {message.topic} >"
     payload_short = " ".join(payload.split())[:INFO_PAYLOAD_LEN]
@@ -46,7 +57,7 @@ def teamtracker(client: Client, user_data: _UserData, message: MQTTMessage):
     if "selected_game" not in message.topic and "all_games" not in message.topic:
         return
 
-    payload = _process_message(message, is_json=True)
+    payload = _process_message(user_data, message, is_json=True)
     if "selected_game" in message.topic:
         user_data["data"].selected_game = payload
     if "all_games" in message.topic:
@@ -54,13 +65,13 @@ def teamtracker(client: Client, user_data: _UserData, message: MQTTMessage):
 
 
 def update_view(client: Client, user_data: _UserData, message: MQTTMessage):
-    view = _process_message(message)
+    view = _process_message(user_data, message)
     user_data["data"].view = view
     user_data["entities"]["View"].set_selection(view)
 
 
 def music_switch(client: Client, user_data: _UserData, message: MQTTMessage):
-    state = _process_message(message)
+    state = _process_message(user_data, message)
     user_data["data"].switch_to_music = state == "ON"
     if state == "ON":
         user_data["entities"]["Switch to Music"].on()
@@ -69,7 +80,7 @@ def music_switch(client: Client, user_data: _UserData, message: MQTTMessage):
 
 
 def averages(client: Client, user_data: _UserData, message: MQTTMessage):
-    payload = _process_message(message, is_json=True)
+    payload = _process_message(user_data, message, is_json=True)
     if "averages" not in payload:
         return
 
@@ -77,14 +88,14 @@ def averages(client: Client, user_data: _UserData, message: MQTTMessage):
 
 
 def game_of_life_buttons(client: Client, user_data: _UserData, message: MQTTMessage):
-    payload = _process_message(message)
-    user_data["data"].game_of_life_commands.put_nowait(payload)
+    payload = _process_message(user_data, message)
+    user_data["data"].put_command("game_of_life_commands", payload)
 
 
 def game_of_life_gens_switch(
     client: Client, user_data: _UserData, message: MQTTMessage
 ):
-    state = _process_message(message)
+    state = _process_message(user_data, message)
     user_data["data"].game_of_life_show_gens = state == "ON"
     if state == "ON":
         user_data["entities"]["Game of Life Show Gens"].on()
@@ -93,7 +104,7 @@ def game_of_life_gens_switch(
 
 
 def game_of_life_spt(client: Client, user_data: _UserData, message: MQTTMessage):
-    seconds = _process_message(message)
+    seconds = _process_message(user_data, message)
     try:
         seconds = float(seconds)
     except ValueError:
@@ -102,8 +113,40 @@ def game_of_life_spt(client: Client, user_data: _UserData, message: MQTTMessage)
     user_data["entities"]["Game of Life Seconds Per Tick"].set_value(seconds)
 
 
+def game_of_life_engine(client: Client, user_data: _UserData, message: MQTTMessage):
+    engine = _process_message(user_data, message)
+    if engine not in LIFE_ENGINES:
+        engine = DENSE
+    user_data["data"].game_of_life_engine = engine
+    user_data["entities"]["Game of Life Engine"].set_selection(engine)
+
+
+def game_of_life_on_cycle(client: Client, user_data: _UserData, message: MQTTMessage):
+    action = _process_message(user_data, message)
+    if action not in CYCLE_ACTIONS:
+        action = KEEP_RUNNING
+    user_data["data"].game_of_life_on_cycle = action
+    user_data["entities"]["Game of Life On Cycle"].set_selection(action)
+
+
+def game_of_life_rule(client: Client, user_data: _UserData, message: MQTTMessage):
+    rule = _process_message(user_data, message)
+    if rule not in RULES:
+        rule = CONWAY
+    user_data["data"].game_of_life_rule = rule
+    user_data["entities"]["Game of Life Rule"].set_selection(rule)
+
+
+def game_of_life_pattern(client: Client, user_data: _UserData, message: MQTTMessage):
+    pattern = _process_message(user_data, message)
+    if pattern not in pattern_library():
+        pattern = RANDOM_PATTERN
+    user_data["data"].game_of_life_pattern = pattern
+    user_data["entities"]["Game of Life Pattern"].set_selection(pattern)
+
+
 def weather(client: Client, user_data: _UserData, message: MQTTMessage):
-    payload = _process_message(message, is_json=True)
+    payload = _process_message(user_data, message, is_json=True)
     if "condition" not in payload:
         return
 
@@ -111,7 +154,7 @@ def weather(client: Client, user_data: _UserData, message: MQTTMessage):
 
 
 def update_forecast_type(client: Client, user_data: _UserData, message: MQTTMessage):
-    f_type = _process_message(message)
+    f_type = _process_message(user_data, message)
     if f_type not in FORECAST_TYPE:
         f_type = DAILY
     user_data["data"].forecast_type = f_type
@@ -119,7 +162,7 @@ def update_forecast_type(client: Client, user_data: _UserData, message: MQTTMess
 
 
 def update_secondary_type(client: Client, user_data: _UserData, message: MQTTMessage):
-    s_type = _process_message(message)
+    s_type = _process_message(user_data, message)
     if s_type not in SECONDARY_TYPE:
         s_type = SECONDARY_DEFAULT.name
     user_data["data"].secondary_type = s_type
@@ -127,16 +170,16 @@ def update_secondary_type(client: Client, user_data: _UserData, message: MQTTMes
 
 
 def songrec_reset_button(client: Client, user_data: _UserData, message: MQTTMessage):
-    payload = _process_message(message)
+    payload = _process_message(user_data, message)
     if payload == "RESET":
         user_data["data"].reset_music()
 
 
 def music_timeout_number(client: Client, user_data: _UserData, message: MQTTMessage):
-    seconds = _process_message(message)
+    seconds = _process_message(user_data, message)
     user_data["data"].music_timeout = seconds
 
 
 def flappy_bird_commands(client: Client, user_data: _UserData, message: MQTTMessage):
-    payload = _process_message(message)
-    user_data["data"].flappy_bird_commands.put_nowait(payload)
+    payload = _process_message(user_data, message)
+    user_data["data"].put_command("flappy_bird_commands", payload)
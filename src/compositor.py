@@ -0,0 +1,181 @@
+import numpy as np
+from PIL import Image
+
+# left, top, right, bottom, right and bottom exclusive
+Rect = tuple[int, int, int, int]
+
+
+class SpriteImage(object):
+    """Premultiplied RGB and alpha, ready to blend.
+
+    Pixel art is mostly fully opaque or fully clear, so an image whose alpha
+    is only ever 0 or 255 is copied through a mask instead of blended, and
+    one with no clear pixels at all is copied straight.
+    """
+
+    def __init__(self, rgb: np.ndarray, alpha: np.ndarray) -> None:
+        self.rgb = rgb
+        self.alpha = alpha
+        self.inverse_alpha = 255 - alpha.astype(np.uint16)
+        self.opaque = bool(alpha.min() == 255)
+        # where to copy, None if some pixels are only partly clear
+        self.mask: np.ndarray = None
+        if np.isin(alpha, (0, 255)).all():
+            self.mask = alpha == 255
+
+    @classmethod
+    def from_image(cls, image: Image.Image) -> "SpriteImage":
+        rgba = np.asarray(image.convert("RGBA"))
+        alpha = rgba[..., 3:].copy()
+        premultiplied = (rgba[..., :3].astype(np.uint16) * alpha + 127) // 255
+        return cls(premultiplied.astype(np.uint8), alpha)
+
+    @classmethod
+    def blank(cls, width: int, height: int) -> "SpriteImage":
+        """A fully clear image to paste sprites into"""
+        rgb = np.zeros((height, width, 3), dtype=np.uint8)
+        return cls(rgb, np.zeros((height, width, 1), dtype=np.uint8))
+
+    @property
+    def width(self) -> int:
+        return self.rgb.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.rgb.shape[0]
+
+    def paste(self, sprite: "SpriteImage", x: int, y: int) -> None:
+        """Replace the pixels under sprite at (x, y) with it"""
+        left, top = max(0, x), max(0, y)
+        right = min(self.width, x + sprite.width)
+        bottom = min(self.height, y + sprite.height)
+        if left >= right or top >= bottom:
+            return
+
+        dst = np.s_[top:bottom, left:right]
+        src = np.s_[top - y : bottom - y, left - x : right - x]
+        self.rgb[dst] = sprite.rgb[src]
+        self.alpha[dst] = sprite.alpha[src]
+        self.inverse_alpha[dst] = sprite.inverse_alpha[src]
+        self.opaque = bool(self.alpha.min() == 255)
+        if sprite.mask is None:
+            self.mask = None
+        elif self.mask is not None:
+            self.mask[dst] = sprite.mask[src]
+
+    def window(self, left: int, width: int) -> "SpriteImage":
+        """Columns [left, left + width) sharing this image's pixels"""
+        columns = np.s_[:, left : left + width]
+        return SpriteImage(self.rgb[columns], self.alpha[columns])
+
+
+class Compositor(object):
+    """An RGB back buffer of sprites stacked over an opaque backdrop.
+
+    The backdrop starts as the background color and opaque strips can be
+    copied into it. Sprites are drawn bottom first every frame, then
+    compose() repaints only the rects where one appeared, moved or went
+    away, or the backdrop changed: copied from the backdrop with every
+    sprite over them blended in again. Sprites are matched from frame to
+    frame by image and position, so a frame where nothing moved costs
+    nothing. pixels can go to the matrix as it is.
+    """
+
+    def __init__(self, width: int, height: int, background) -> None:
+        self.width = width
+        self.height = height
+        self.background = np.array(background[:3], dtype=np.uint8)
+        self.backdrop = np.empty((height, width, 3), dtype=np.uint8)
+        self.backdrop[...] = self.background
+        self.pixels = self.backdrop.copy()
+        self._scratch = np.empty((height, width, 3), dtype=np.uint16)
+        # this frame's sprites so far, and the ones in pixels now
+        self._layers: list[tuple[SpriteImage, int, int]] = []
+        self._composed: list[tuple[SpriteImage, int, int]] = []
+        # backdrop changed under these since the last compose
+        self._invalid: list[Rect] = []
+
+    def draw(self, sprite: SpriteImage, x: float, y: float) -> None:
+        self._layers.append((sprite, int(round(x)), int(round(y))))
+
+    def set_backdrop(self, pixels: np.ndarray, x: int, y: int) -> None:
+        """Copy a (height, width, 3) uint8 array into the backdrop at (x, y)"""
+        height, width = pixels.shape[:2]
+        rect = self._bounds(x, y, width, height)
+        if rect is None:
+            return
+
+        left, top, right, bottom = rect
+        self.backdrop[top:bottom, left:right] = pixels[
+            top - y : bottom - y, left - x : right - x
+        ]
+        self._invalid.append(rect)
+
+    def invalidate(self) -> None:
+        """Repaint all of pixels on the next compose"""
+        self._invalid.append((0, 0, self.width, self.height))
+
+    def _bounds(self, x: int, y: int, width: int, height: int) -> Rect:
+        """The part of a width x height block at (x, y) on the buffer, None
+        if it's off it"""
+        left = max(0, x)
+        top = max(0, y)
+        right = min(self.width, x + width)
+        bottom = min(self.height, y + height)
+        if left >= right or top >= bottom:
+            return None
+        return left, top, right, bottom
+
+    def dirty_rects(self) -> list[Rect]:
+        changed = set(self._layers).symmetric_difference(self._composed)
+        rects = self._invalid + [
+            rect
+            for rect in (
+                self._bounds(x, y, sprite.width, sprite.height)
+                for sprite, x, y in changed
+            )
+            if rect
+        ]
+        area = sum(
+            (right - left) * (bottom - top) for left, top, right, bottom in rects
+        )
+        if area * 2 >= self.width * self.height:
+            # overlapping rects would repaint most of it more than once
+            return [(0, 0, self.width, self.height)]
+        return rects
+
+    def _blend(self, sprite: SpriteImage, x: int, y: int, rect: Rect) -> None:
+        left, top, right, bottom = rect
+        left, top = max(left, x), max(top, y)
+        right = min(right, x + sprite.width)
+        bottom = min(bottom, y + sprite.height)
+        if left >= right or top >= bottom:
+            return
+
+        dst = self.pixels[top:bottom, left:right]
+        src = np.s_[top - y : bottom - y, left - x : right - x]
+        if sprite.opaque:
+            dst[...] = sprite.rgb[src]
+        elif sprite.mask is not None:
+            np.copyto(dst, sprite.rgb[src], where=sprite.mask[src])
+        else:
+            # premultiplied over: src + dst * (255 - alpha) / 255
+            scratch = self._scratch[top:bottom, left:right]
+            np.multiply(dst, sprite.inverse_alpha[src], out=scratch)
+            np.add(scratch, 127, out=scratch)
+            np.floor_divide(scratch, 255, out=scratch)
+            np.add(scratch, sprite.rgb[src], out=scratch)
+            np.copyto(dst, scratch, casting="unsafe")
+
+    def compose(self) -> np.ndarray:
+        """Bring pixels up to date with the sprites drawn since the last call"""
+        for rect in self.dirty_rects():
+            left, top, right, bottom = rect
+            self.pixels[top:bottom, left:right] = self.backdrop[top:bottom, left:right]
+            for layer in self._layers:
+                self._blend(*layer, rect)
+
+        self._composed = self._layers
+        self._layers = []
+        self._invalid = []
+        return self.pixels
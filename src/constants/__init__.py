@@ -20,6 +20,19 @@ TEMPERATURE_OFFSET = 6.0
 INFO_PAYLOAD_LEN = 50
 SONGREC_TIMEOUT_SECS = 30.0 * 60.0
 
+""" Render Stats and Frame Rate """
+FRAME_STATS_WINDOW = 300  # frames of history kept per view
+TARGET_FPS = 60.0
+IDLE_FPS = 2.0
+IDLE_POLL_SECS = 0.1  # how often an idle frame wait checks for a view change
+DRAW_BUDGET_SECS = 0.020  # draws slower than this are sampled and logged
+WATCHDOG_SAMPLE_SECS = 0.002
+WATCHDOG_MAX_STACKS = 3  # most common stacks written per slow frame
+
+""" Text Rendering """
+TEXT_CACHE_SIZE = 256  # rendered strings kept per font
+WIDTH_CACHE_SIZE = 512  # measured strings kept per font
+
 """ VIEW NAMES """
 ALLGAMES = "All Games"
 DASHBOARD = "Dashboard"
@@ -88,6 +101,48 @@ ALIVE_RGB = np.array(list(WHITE.rgb))
 DEAD_RGB = np.array(list(BLACK.rgb))
 ADD_NOISE = "ADD_NOISE"
 RESET = "RESET"
+# most generations stepped to catch up before a frame, the rest are dropped
+MAX_TICKS_PER_FRAME = 64
+FAST_FORWARD = "FAST_FORWARD"
+FAST_FORWARD_POWER = 10  # fast forward jumps 2**power generations
+DENSE = "Dense"
+HASHLIFE = "Hashlife"
+STRIPED = "Striped"
+SPARSE = "Sparse"
+# no Striped, GRID_HEIGHT is too short to split into stripes of STRIPE_MIN_ROWS
+LIFE_ENGINES = [DENSE, HASHLIFE, SPARSE]
+STRIPED_WORKERS = 4  # one per core on a Pi 4
+STRIPE_MIN_ROWS = 64  # shorter stripes cost more in handoff than they save
+HASHLIFE_MAX_NODES = 500_000  # canonical nodes kept before a collection
+VIEWPORT_EASE = 0.1  # part of the way to the activity panned each tick
+CYCLE_MAX_PERIOD = 30  # longest oscillator spotted, covers the common ones
+KEEP_RUNNING = "Keep Running"
+# what to do once the grid settles: command sent
+CYCLE_ACTIONS: dict[str, str] = {
+    KEEP_RUNNING: None,
+    "Add Noise": ADD_NOISE,
+    "Reset": RESET,
+}
+CYCLE_ACTION_GENERATIONS = 100  # how long a settled grid is shown first
+CONWAY = "Conway"
+# B/S notation, a third number makes it a Generations rule with that many states
+RULES: dict[str, str] = {
+    CONWAY: "B3/S23",
+    "HighLife": "B36/S23",
+    "Day & Night": "B3678/S34678",
+    "Seeds": "B2/S",
+    "Life Without Death": "B3/S012345678",
+    "Maze": "B3/S12345",
+    "2x2": "B36/S125",
+    "Brian's Brain": "B2/S/C3",
+    "Star Wars": "B2/S345/C4",
+    "Fireworks": "B13/S2/C21",
+}
+DYING_RGB = np.array(list(ROYALBLUE.rgb))  # first dying state, fades to black
+RANDOM_PATTERN = "Random"
+PATTERNS_PATH = "../patterns"
+# parsed cells of every pattern, rewritten when a pattern file changes
+PATTERN_INDEX = "../patterns/index.npz"
 
 """ Sports """
 HOME = "home"
@@ -1,8 +1,14 @@
+from collections import OrderedDict
 import os
 import sys
 
+import numpy as np
 from rgbmatrix.graphics import Font
 
+from bdf import BDFFont
+from constants import WIDTH_CACHE_SIZE
+from glyphatlas import GlyphAtlas
+
 file_path = os.path.abspath(__file__)
 root_folder = os.path.abspath(os.path.dirname(os.path.dirname(file_path)))
 sys.path.append(root_folder)
@@ -12,12 +18,60 @@ class MonoFont(Font):
     def __init__(self, font_path: str) -> None:
         super().__init__()
         super().LoadFont(font_path)
+        self.font_path = font_path
+        self._bdf_font: BDFFont = None
+        self._atlas: GlyphAtlas = None
+        self._widths: np.ndarray = None
+        self._width_cache: OrderedDict[str, int] = OrderedDict()
+
+    @property
+    def bdf(self) -> BDFFont:
+        """Glyph bitmaps for drawing into a FrameBuffer, parsed on first use"""
+        if self._bdf_font is None:
+            self._bdf_font = BDFFont.load(self.font_path)
+        return self._bdf_font
+
+    @property
+    def atlas(self) -> GlyphAtlas:
+        """Glyphs packed for rendering whole strings at once, built on first use"""
+        if self._atlas is None:
+            self._atlas = GlyphAtlas(self.bdf)
+        return self._atlas
+
+    @property
+    def widths(self) -> np.ndarray:
+        """CharacterWidth for every codepoint up to the font's last glyph"""
+        if self._widths is None:
+            glyphs = self.bdf.glyphs
+            # -1 for missing characters, same as CharacterWidth
+            widths = np.full(max(glyphs) + 2, -1, dtype=np.int32)
+            for codepoint, glyph in glyphs.items():
+                widths[codepoint] = glyph.device_width
+            self._widths = widths
+        return self._widths
 
     def str_width(self, string: str) -> int:
         if string is None:
             return 0
 
-        return sum([self.CharacterWidth(ord(char)) for char in string])
+        width = self._width_cache.get(string)
+        if width is not None:
+            self._width_cache.move_to_end(string)
+            return width
+
+        widths = self.widths
+        # surrogatepass so lone surrogates from json get a width, like ord() did
+        codepoints = np.frombuffer(
+            string.encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+        )
+        # anything past the table is missing, the last entry is always -1
+        codepoints = np.minimum(codepoints, len(widths) - 1)
+        width = int(widths[codepoints].sum())
+
+        self._width_cache[string] = width
+        if len(self._width_cache) > WIDTH_CACHE_SIZE:
+            self._width_cache.popitem(last=False)
+        return width
 
 
 FONT_4X6 = MonoFont("../fonts/4x6.bdf")
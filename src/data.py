@@ -1,8 +1,8 @@
-import asyncio
 from base64 import b64decode
 from io import BytesIO
 import json
 import logging
+from queue import Queue
 from time import perf_counter
 
 from dbus_next.errors import DBusError
@@ -10,6 +10,10 @@ from PIL import Image, ImageChops
 
 from constants import (
     DEFAULT_VIEW,
+    CONWAY,
+    DENSE,
+    KEEP_RUNNING,
+    RANDOM_PATTERN,
     GAMEOFLIFE,
     HOURLY,
     DAILY,
@@ -18,16 +22,25 @@ from constants import (
 )
 from constants.secondaryinfo import SECONDARY_DEFAULT
 from eqstream import EQStream
+from framestats import RenderStats
+from recording import Recorder
 from utils.images import get_dominant_colors, get_min_constrast_colors
 
-
 logger = logging.getLogger(__name__)
 
 
 class Data(object):
     """Class to share data between async functions"""
 
-    def __init__(self):
+    # values the views set while drawing, copied back from render snapshots
+    render_outputs = (
+        "game_of_life_cells",
+        "game_of_life_generations",
+        "game_of_life_period",
+        "game_of_life_period_generation",
+    )
+
+    def __init__(self, listen: bool = True):
         self.is_running = True
         self.view: str = DEFAULT_VIEW
         self.switch_to_music: bool = True
@@ -35,7 +48,8 @@ class Data(object):
         self.reset_music()
         self.music_timeout: int = SONGREC_TIMEOUT_SECS
         self.eq_stream: EQStream = EQStream()
-        self.eq_stream.listen()
+        if listen:
+            self.eq_stream.listen()
 
         self.temperature = None
         self.humidity = None
@@ -47,17 +61,27 @@ class Data(object):
         self.selected_game: dict = {}
         self.all_games: dict = {}
 
-        self.game_of_life_commands = asyncio.Queue()
+        self.game_of_life_commands: Queue = Queue()
         self.game_of_life_cells: int = 0
         self.game_of_life_generations: int = 0
         self.game_of_life_show_gens: bool = False
         self.game_of_life_seconds_per_tick: float = 0.2
+        self.game_of_life_engine: str = DENSE
+        self.game_of_life_rule: str = CONWAY
+        self.game_of_life_pattern: str = RANDOM_PATTERN
+        # 0 until the grid repeats itself
+        self.game_of_life_period: int = 0
+        self.game_of_life_period_generation: int = 0
+        self.game_of_life_on_cycle: str = KEEP_RUNNING
 
         self.weather_forecast: dict = None
         self.forecast_type: str = DAILY
         self.secondary_type: str = SECONDARY_DEFAULT.name
 
-        self.flappy_bird_commands = asyncio.Queue()
+        self.flappy_bird_commands: Queue = Queue()
+
+        self.render_stats: RenderStats = RenderStats()
+        self.recorder: Recorder = None
 
     def reset_music(self):
         logger.info("Reset music")
@@ -73,6 +97,28 @@ class Data(object):
         self.eq_stream.stop()
         self.is_running = False
 
+    def snapshot(self, into: "Data" = None) -> "Data":
+        """Shallow copy for the render thread to draw a frame from.
+
+        Callbacks replace values rather than changing them in place, so the
+        copy doesn't change underneath a view while it draws. Pass a
+        previous snapshot as into to reuse it instead of allocating.
+        """
+        if into is None:
+            into = Data.__new__(Data)
+        into.__dict__.update(self.__dict__)
+        return into
+
+    def commit_render(self, snapshot: "Data") -> None:
+        for name in self.render_outputs:
+            setattr(self, name, getattr(snapshot, name))
+
+    def put_command(self, queue: str, command: str) -> None:
+        if self.recorder is not None:
+            self.recorder.command(queue, command, getattr(self, queue))
+        else:
+            getattr(self, queue).put_nowait(command)
+
     def _str(self, val, round_digits=None) -> str:
         is_number = type(val) is int or type(val) is float
         if is_number:
@@ -80,6 +126,11 @@ class Data(object):
 
         return str(val) if val is not None else ""
 
+    def _ms(self, seconds: float) -> str:
+        if seconds is None:
+            return ""
+        return self._str(seconds * 1000.0, round_digits=2)
+
     def _on_off(self, b: bool, line: str = "") -> str:
         return f"{'on' if b else 'off'}{line}"
 
@@ -130,6 +181,14 @@ class Data(object):
             "value": self._str(self.game_of_life_cells),
             "available": "online",
         }
+        payload["gol_period"] = {
+            "value": self._str(self.game_of_life_period),
+            "available": "online",
+        }
+        payload["gol_period_generation"] = {
+            "value": self._str(self.game_of_life_period_generation),
+            "available": "online",
+        }
         payload["gol_show_gens"] = {
             "value": self._on_off(self.game_of_life_show_gens).upper(),
             "available": self._on_off(self.view == GAMEOFLIFE, "line"),
@@ -142,8 +201,28 @@ class Data(object):
             "value": None,
             "available": self._on_off(self.view == GAMEOFLIFE, "line"),
         }
+        payload["gol_fast_forward"] = {
+            "value": None,
+            "available": self._on_off(self.view == GAMEOFLIFE, "line"),
+        }
+        payload["gol_engine"] = {
+            "value": self._str(self.game_of_life_engine),
+            "available": self._on_off(self.view == GAMEOFLIFE, "line"),
+        }
+        payload["gol_rule"] = {
+            "value": self._str(self.game_of_life_rule),
+            "available": self._on_off(self.view == GAMEOFLIFE, "line"),
+        }
+        payload["gol_pattern"] = {
+            "value": self._str(self.game_of_life_pattern),
+            "available": self._on_off(self.view == GAMEOFLIFE, "line"),
+        }
+        payload["gol_on_cycle"] = {
+            "value": self._str(self.game_of_life_on_cycle),
+            "available": self._on_off(self.view == GAMEOFLIFE, "line"),
+        }
         payload["gol_seconds_per_tick"] = {
-            "value": self._str(self.game_of_life_seconds_per_tick, round_digits=1),
+            "value": self._str(self.game_of_life_seconds_per_tick, round_digits=3),
             "available": self._on_off(self.view == GAMEOFLIFE, "line"),
         }
         payload["forecast_type"] = {
@@ -155,6 +234,32 @@ class Data(object):
             "available": "online",
         }
 
+        stats = self.render_stats.get(self.view)
+        payload["render_fps"] = {
+            "value": self._str(stats.fps, round_digits=1),
+            "available": "online",
+        }
+        payload["render_draw_p50"] = {
+            "value": self._ms(stats.draw_times.percentile(50)),
+            "available": "online",
+        }
+        payload["render_draw_p99"] = {
+            "value": self._ms(stats.draw_times.percentile(99)),
+            "available": "online",
+        }
+        payload["render_swap_p50"] = {
+            "value": self._ms(stats.swap_times.percentile(50)),
+            "available": "online",
+        }
+        payload["render_dropped"] = {
+            "value": self._str(stats.dropped_frames),
+            "available": "online",
+        }
+        payload["render_slow"] = {
+            "value": self._str(stats.slow_frames),
+            "available": "online",
+        }
+
         return payload
 
     def get_json(self) -> str:
@@ -0,0 +1,134 @@
+from collections import Counter
+import logging
+import os
+import sys
+from threading import Event, Lock, Thread, get_ident
+from time import perf_counter, sleep
+from types import CodeType
+
+from constants import DRAW_BUDGET_SECS, WATCHDOG_MAX_STACKS, WATCHDOG_SAMPLE_SECS
+
+logger = logging.getLogger("diagnostics")
+
+# the code and line of each frame, outermost first
+Stack = tuple[tuple[CodeType, int], ...]
+
+
+def _depth(frame) -> int:
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+def _stack(frame, skip: int = 0) -> Stack:
+    """Cheap enough to take while a draw runs, it's named in report()"""
+    calls = []
+    while frame is not None:
+        calls.append((frame.f_code, frame.f_lineno))
+        frame = frame.f_back
+    calls.reverse()
+    return tuple(calls[skip:])
+
+
+def _format(code: CodeType, lineno: int) -> str:
+    return f"{os.path.basename(code.co_filename)}:{lineno} {code.co_name}"
+
+
+class DrawWatchdog(Thread):
+    """Samples the render thread's stack while a draw runs over budget.
+
+    The render thread marks the start and end of each draw, and once a draw
+    passes the budget this thread samples where it is until it finishes so
+    slow frames can be written to the diagnostics log with the stacks seen.
+    """
+
+    def __init__(
+        self,
+        budget: float = DRAW_BUDGET_SECS,
+        interval: float = WATCHDOG_SAMPLE_SECS,
+    ) -> None:
+        super().__init__(name="draw-watchdog", daemon=True)
+        self.budget = budget
+        self.interval = interval
+        self.is_running = True
+
+        self._lock = Lock()
+        self._draw_started = Event()
+        self._target: int = None
+        # frames below the render loop, the thread and event loop plumbing
+        self._skip = 0
+        self._draw = 0
+        self._drawing = False
+        self._start: float = None
+        self._samples: Counter[Stack] = Counter()
+
+    def begin(self) -> None:
+        """Called by the render thread just before a view draws"""
+        with self._lock:
+            if self._target is None:
+                self._target = get_ident()
+                self._skip = _depth(sys._getframe(1)) - 1
+            self._draw += 1
+            self._drawing = True
+            self._start = perf_counter()
+            self._samples = Counter()
+        self._draw_started.set()
+
+    def end(self) -> Counter[Stack]:
+        """Called by the render thread after the draw, returns the samples"""
+        with self._lock:
+            self._drawing = False
+            return self._samples
+
+    def stop(self) -> None:
+        self.is_running = False
+        self._draw_started.set()
+
+    def run(self) -> None:
+        while self.is_running:
+            if not self._draw_started.wait(timeout=1.0):
+                continue
+            self._draw_started.clear()
+
+            with self._lock:
+                draw = self._draw
+                deadline = self._start + self.budget
+            sleep(max(0.0, deadline - perf_counter()))
+
+            while self.is_running:
+                with self._lock:
+                    if not self._drawing or self._draw != draw:
+                        break
+                    frame = sys._current_frames().get(self._target)
+                # walked without the lock, end() shouldn't wait on a sample
+                if frame is not None:
+                    stack = _stack(frame, self._skip)
+                    del frame
+                    with self._lock:
+                        # the draw may have finished while it was walked
+                        if self._drawing and self._draw == draw:
+                            self._samples[stack] += 1
+                sleep(self.interval)
+
+    def report(
+        self,
+        view: str,
+        draw_time: float,
+        samples: Counter[Stack],
+        changed: list[str],
+    ) -> None:
+        lines = [
+            f"Slow frame: {view} drew in {draw_time * 1000:.1f}ms "
+            f"(budget {self.budget * 1000:.1f}ms)",
+            f"  changed data: {', '.join(changed) or 'none'}",
+        ]
+        total = sum(samples.values())
+        for stack, count in samples.most_common(WATCHDOG_MAX_STACKS):
+            lines.append(f"  {count}/{total} samples:")
+            lines.extend(f"    {_format(*call)}" for call in stack)
+        if not total:
+            lines.append("  no samples, the draw finished just after the budget")
+
+        logger.info("\n".join(lines))
@@ -0,0 +1,141 @@
+import numpy as np
+from PIL import Image
+
+
+class FrameBuffer(object):
+    """Preallocated RGB frame that views draw into.
+
+    Keeps the rgbmatrix canvas method names so views can draw into it the
+    same way, then the whole frame goes to the matrix with one SetImage.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.pixels = np.zeros((height, width, 3), dtype=np.uint8)
+        self._image = Image.new("RGB", (width, height))
+
+    def Clear(self) -> None:
+        self.pixels.fill(0)
+
+    def Fill(self, red: int, green: int, blue: int) -> None:
+        self.pixels[:, :] = (red, green, blue)
+
+    def SetPixel(self, x: int, y: int, red: int, green: int, blue: int) -> None:
+        x = int(x)
+        y = int(y)
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y, x] = (red, green, blue)
+
+    def _clip(self, x: int, y: int, width: int, height: int):
+        """Return the frame and source slices for a rect, None if fully outside"""
+        left = max(0, x)
+        top = max(0, y)
+        right = min(self.width, x + width)
+        bottom = min(self.height, y + height)
+        if left >= right or top >= bottom:
+            return None
+
+        dst = (slice(top, bottom), slice(left, right))
+        src = (slice(top - y, bottom - y), slice(left - x, right - x))
+        return dst, src
+
+    def SetBitmap(self, bitmap: np.ndarray, x: int, y: int, rgb) -> None:
+        """Set every pixel that is True in a 2d bool array to one color"""
+        height, width = bitmap.shape
+        clipped = self._clip(int(x), int(y), width, height)
+        if clipped is None:
+            return
+
+        dst, src = clipped
+        self.pixels[dst][bitmap[src]] = rgb
+
+    def blit(self, pixels: np.ndarray, x: int = 0, y: int = 0) -> None:
+        """Copy a (height, width, 3) uint8 array into the frame"""
+        height, width = pixels.shape[:2]
+        clipped = self._clip(int(x), int(y), width, height)
+        if clipped is None:
+            return
+
+        dst, src = clipped
+        self.pixels[dst] = pixels[src]
+
+    def SetImage(
+        self, image: Image.Image | np.ndarray, offset_x=0, offset_y=0, unsafe=True
+    ):
+        if isinstance(image, Image.Image):
+            if image.mode != "RGB":
+                raise ValueError(f"Only RGB images can be set, not {image.mode}")
+            image = np.asarray(image)
+
+        self.blit(image, offset_x, offset_y)
+
+    def fill_rect(self, x0: int, y0: int, x1: int, y1: int, rgb) -> None:
+        """Fill the rect between two corners, inclusive like ImageDraw"""
+        left = max(0, int(x0))
+        top = max(0, int(y0))
+        right = min(self.width, int(x1) + 1)
+        bottom = min(self.height, int(y1) + 1)
+        if left < right and top < bottom:
+            self.pixels[top:bottom, left:right] = rgb
+
+    def rectangle(self, x0: int, y0: int, x1: int, y1: int, outline, fill=None):
+        """Same as ImageDraw.rectangle, corners are inclusive"""
+        if fill is not None:
+            self.fill_rect(x0, y0, x1, y1, fill)
+        self.fill_rect(x0, y0, x1, y0, outline)
+        self.fill_rect(x0, y1, x1, y1, outline)
+        self.fill_rect(x0, y0, x0, y1, outline)
+        self.fill_rect(x1, y0, x1, y1, outline)
+
+    def line(self, x0: int, y0: int, x1: int, y1: int, rgb) -> None:
+        x0, y0, x1, y1 = int(x0), int(y0), int(x1), int(y1)
+        if x0 == x1 or y0 == y1:
+            self.fill_rect(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1), rgb)
+            return
+
+        # Bresenham, same as the rgbmatrix DrawLine
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            self.SetPixel(x0, y0, *rgb)
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def draw_text(self, font, x: int, y: int, rgb, text: str) -> int:
+        """Draw text with its baseline at y, returns the width drawn"""
+        atlas = font.atlas
+        rendered = atlas.render(text)
+        top = int(y) - atlas.baseline
+        self.SetBitmap(rendered.bitmap, int(x) + rendered.left, top, rgb)
+        return rendered.width
+
+    @property
+    def image(self) -> Image.Image:
+        """The frame as a PIL image, reuses the same image every call"""
+        self._image.frombytes(self.pixels.data)
+        return self._image
+
+    def upload(self, canvas) -> None:
+        """Push the whole frame to a matrix canvas in one call"""
+        canvas.SetImage(self.image, 0, 0)
+
+
+def DrawText(canvas: FrameBuffer, font, x: int, y: int, color, text: str) -> int:
+    """Drop in for rgbmatrix.graphics.DrawText that draws into a FrameBuffer"""
+    return canvas.draw_text(font, x, y, (color.red, color.green, color.blue), text)
+
+
+def DrawLine(canvas: FrameBuffer, x1: int, y1: int, x2: int, y2: int, color) -> None:
+    """Drop in for rgbmatrix.graphics.DrawLine that draws into a FrameBuffer"""
+    canvas.line(x1, y1, x2, y2, (color.red, color.green, color.blue))
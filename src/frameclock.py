@@ -0,0 +1,43 @@
+from datetime import datetime
+from threading import local
+from time import perf_counter as _perf_counter, time as _time
+
+
+class FrameClock(local):
+    """perf_counter, held still while the render thread works on a frame.
+
+    Everything a view does for one frame sees the same time, the time the
+    frame is stamped with in a recording, so a replay on the recorded clock
+    animates exactly like the panel did. The wall clock is held along with
+    it. Other threads, like the Game of Life worker, always see the real
+    clocks.
+    """
+
+    def __init__(self) -> None:
+        self.now: float = None
+        # time.time() when now was held
+        self.wall: float = None
+
+    def __call__(self) -> float:
+        if self.now is None:
+            return _perf_counter()
+        return self.now
+
+    def wall_time(self) -> float:
+        if self.now is None:
+            return _time()
+        return self.wall
+
+    def hold(self, now: float) -> None:
+        """Return now on this thread until the next hold"""
+        self.now = now
+        self.wall = _time()
+
+
+# views time their animations with this in place of time.perf_counter
+perf_counter = FrameClock()
+
+
+def now() -> datetime:
+    """The local date and time, held still along with perf_counter"""
+    return datetime.fromtimestamp(perf_counter.wall_time())
@@ -0,0 +1,131 @@
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+
+from constants import DRAW_BUDGET_SECS, FRAME_STATS_WINDOW, TARGET_FPS
+
+
+class RollingHistogram(object):
+    """Fixed size window of samples, percentiles are computed on demand"""
+
+    def __init__(self, size: int = FRAME_STATS_WINDOW) -> None:
+        self.samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def add(self, sample: float) -> None:
+        self.samples.append(sample)
+
+    def clear(self) -> None:
+        self.samples.clear()
+
+    def percentile(self, percent: float) -> float:
+        samples = self._copy()
+        if not samples:
+            return None
+        return float(np.percentile(samples, percent))
+
+    def mean(self) -> float:
+        samples = self._copy()
+        if not samples:
+            return None
+        return sum(samples) / len(samples)
+
+    def _copy(self) -> tuple[float, ...]:
+        # the render thread appends while the mqtt loop reads, copying in one
+        # call avoids iterating over the deque while it changes
+        return tuple(self.samples)
+
+
+class FrameStats(object):
+    def __init__(self, frame_interval: float = 1.0 / TARGET_FPS) -> None:
+        self.frame_interval = frame_interval
+        self.draw_times = RollingHistogram()
+        self.swap_times = RollingHistogram()
+        self.frame_times = RollingHistogram()
+        self.frames: int = 0
+        self.skipped_frames: int = 0
+        self.dropped_frames: int = 0
+        self.slow_frames: int = 0  # draws over DRAW_BUDGET_SECS
+        self._last_frame: float = None
+
+    def reset_interval(self) -> None:
+        """Don't count the gap while the view wasn't showing as a slow frame"""
+        self._last_frame = None
+
+    def record(
+        self,
+        draw_time: float,
+        swap_time: float,
+        frame_interval: float = None,
+        now: float = None,
+    ) -> None:
+        if now is None:
+            now = perf_counter()
+        if frame_interval is not None:
+            self.frame_interval = frame_interval
+
+        self.frames += 1
+        if draw_time > DRAW_BUDGET_SECS:
+            self.slow_frames += 1
+        self.draw_times.add(draw_time)
+        self.swap_times.add(swap_time)
+
+        if self._last_frame is not None:
+            frame_time = now - self._last_frame
+            self.frame_times.add(frame_time)
+            # every deadline that passed without a new frame is a dropped one
+            missed = round(frame_time / self.frame_interval) - 1
+            if missed > 0:
+                self.dropped_frames += missed
+
+        self._last_frame = now
+
+    def skip(self, frame_interval: float = None, now: float = None) -> None:
+        """The previous frame was still current, so it was reused as is"""
+        if now is None:
+            now = perf_counter()
+        if frame_interval is not None:
+            self.frame_interval = frame_interval
+
+        self.skipped_frames += 1
+        if self._last_frame is not None:
+            self.frame_times.add(now - self._last_frame)
+        self._last_frame = now
+
+    @property
+    def fps(self) -> float:
+        mean = self.frame_times.mean()
+        if not mean:
+            return None
+        return 1.0 / mean
+
+
+class RenderStats(object):
+    """Frame timing for every view that has been drawn"""
+
+    def __init__(self) -> None:
+        self.views: dict[str, FrameStats] = {}
+        self._current: str = None
+
+    def get(self, view: str) -> FrameStats:
+        if view not in self.views:
+            self.views[view] = FrameStats()
+        return self.views[view]
+
+    def _switch_to(self, view: str) -> FrameStats:
+        stats = self.get(view)
+        if view != self._current:
+            stats.reset_interval()
+            self._current = view
+        return stats
+
+    def record(
+        self, view: str, draw_time: float, swap_time: float, frame_interval: float
+    ) -> None:
+        self._switch_to(view).record(draw_time, swap_time, frame_interval)
+
+    def skip(self, view: str, frame_interval: float) -> None:
+        self._switch_to(view).skip(frame_interval)
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from bdf import BDFFont, REPLACEMENT_CHAR
+from constants import TEXT_CACHE_SIZE
+
+
+@dataclass
+class RenderedText:
+    """A string as a mask, left is where column 0 sits relative to the pen"""
+
+    bitmap: np.ndarray
+    left: int
+    width: int  # how far the pen moves, same as summing the character widths
+
+
+class GlyphAtlas(object):
+    """Every glyph of a BDF font packed side by side into one bool array.
+
+    Rows line up across glyphs, so a string is rendered by OR-ing column
+    slices of the atlas into one mask. Rendered strings are kept in an LRU
+    since most labels are drawn again on the next frame.
+    """
+
+    def __init__(self, font: BDFFont, cache_size: int = TEXT_CACHE_SIZE) -> None:
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, RenderedText] = OrderedDict()
+
+        glyphs = list(font.glyphs.values())
+        # rows of each glyph measured down from the top of the font's bounding box
+        tops = [font.baseline - g.height - g.y_offset for g in glyphs]
+        self.top = min([0] + tops)
+        bottom = max([font.height] + [t + g.height for t, g in zip(tops, glyphs)])
+        # where the top row of the atlas is relative to the baseline
+        self.baseline = font.baseline - self.top
+
+        self.bitmap = np.zeros((bottom - self.top, sum(g.width for g in glyphs)), bool)
+        # codepoint: (atlas column, x offset, ink width, device width)
+        self.cells: dict[int, tuple[int, int, int, int]] = {}
+        x = 0
+        for top, glyph in zip(tops, glyphs):
+            row = top - self.top
+            self.bitmap[row : row + glyph.height, x : x + glyph.width] = glyph.bitmap
+            self.cells[glyph.codepoint] = (
+                x,
+                glyph.x_offset,
+                glyph.width,
+                glyph.device_width,
+            )
+            x += glyph.width
+
+        # same fallback as BDFFont.find_glyph
+        self._fallback = self.cells.get(REPLACEMENT_CHAR)
+
+    def _cell(self, char: str) -> tuple[int, int, int, int]:
+        return self.cells.get(ord(char), self._fallback)
+
+    def _render(self, text: str) -> RenderedText:
+        placed = []
+        pen = 0
+        for char in text:
+            cell = self._cell(char)
+            if cell is None:
+                continue
+            placed.append((pen + cell[1], cell))
+            pen += cell[3]
+
+        left = min([0] + [x for x, _ in placed])
+        right = max([pen] + [x + cell[2] for x, cell in placed])
+        bitmap = np.zeros((self.bitmap.shape[0], right - left), bool)
+        for x, (atlas_x, _, width, _) in placed:
+            x -= left
+            bitmap[:, x : x + width] |= self.bitmap[:, atlas_x : atlas_x + width]
+
+        return RenderedText(bitmap, left, pen)
+
+    def render(self, text: str, cache: bool = True) -> RenderedText:
+        if not cache:
+            return self._render(text)
+
+        rendered = self._cache.get(text)
+        if rendered is not None:
+            self._cache.move_to_end(text)
+            return rendered
+
+        rendered = self._render(text)
+        self._cache[text] = rendered
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return rendered
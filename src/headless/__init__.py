@@ -0,0 +1,25 @@
+"""Hardware-free stand-in for the rgbmatrix bindings.
+
+Call install() before anything imports rgbmatrix so views, fonts and colors
+render into NumPy framebuffers instead of the panel.
+"""
+
+import sys
+
+from headless import graphics
+from headless.matrix import FrameCanvas, RGBMatrix, RGBMatrixOptions
+
+
+def install() -> None:
+    """Register this package as rgbmatrix, even if the real bindings are installed"""
+    sys.modules["rgbmatrix"] = sys.modules[__name__]
+    sys.modules["rgbmatrix.graphics"] = graphics
+
+
+__all__ = [
+    "FrameCanvas",
+    "graphics",
+    "install",
+    "RGBMatrix",
+    "RGBMatrixOptions",
+]
@@ -0,0 +1,81 @@
+from math import cos, pi, sin
+
+from bdf import BDFFont
+
+
+class Color(object):
+    def __init__(self, red: int = 0, green: int = 0, blue: int = 0) -> None:
+        self.red = red
+        self.green = green
+        self.blue = blue
+
+    def SetColor(self, red: int, green: int, blue: int) -> None:
+        self.red = red
+        self.green = green
+        self.blue = blue
+
+
+class Font(object):
+    def __init__(self) -> None:
+        self._bdf: BDFFont = None
+
+    def LoadFont(self, file: str) -> None:
+        self._bdf = BDFFont.load(file)
+
+    @property
+    def height(self) -> int:
+        return self._bdf.height
+
+    @property
+    def baseline(self) -> int:
+        return self._bdf.baseline
+
+    def CharacterWidth(self, char: int) -> int:
+        return self._bdf.character_width(char)
+
+    def DrawGlyph(self, c, x: int, y: int, color: Color, char: int) -> int:
+        glyph = self._bdf.find_glyph(char)
+        if glyph is None:
+            return 0
+
+        top = int(y) - glyph.height - glyph.y_offset
+        left = int(x) + glyph.x_offset
+        c.SetBitmap(glyph.bitmap, left, top, (color.red, color.green, color.blue))
+        return glyph.device_width
+
+
+def DrawText(c, font: Font, x: int, y: int, color: Color, text: str) -> int:
+    start = x
+    for char in text:
+        x += font.DrawGlyph(c, x, y, color, ord(char))
+    return x - start
+
+
+def DrawLine(c, x1: int, y1: int, x2: int, y2: int, color: Color) -> None:
+    # Bresenham, same as the C++ implementation
+    x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+    dx = abs(x2 - x1)
+    dy = -abs(y2 - y1)
+    sx = 1 if x1 < x2 else -1
+    sy = 1 if y1 < y2 else -1
+    err = dx + dy
+    while True:
+        c.SetPixel(x1, y1, color.red, color.green, color.blue)
+        if x1 == x2 and y1 == y2:
+            break
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x1 += sx
+        if e2 <= dx:
+            err += dx
+            y1 += sy
+
+
+def DrawCircle(c, x: int, y: int, r: int, color: Color) -> None:
+    steps = max(8, int(2 * pi * r))
+    for i in range(steps):
+        angle = 2 * pi * i / steps
+        px = int(round(x + r * cos(angle)))
+        py = int(round(y + r * sin(angle)))
+        c.SetPixel(px, py, color.red, color.green, color.blue)
@@ -0,0 +1,65 @@
+from PIL import Image
+
+from framebuffer import FrameBuffer
+
+
+class RGBMatrixOptions(object):
+    def __init__(self) -> None:
+        self.rows = 32
+        self.cols = 32
+        self.chain_length = 1
+        self.parallel = 1
+        self.hardware_mapping = "regular"
+        self.gpio_slowdown = 1
+        self.pwm_lsb_nanoseconds = 130
+        self.brightness = 100
+        self.pwm_bits = 11
+        self.show_refresh_rate = False
+
+
+class FrameCanvas(FrameBuffer):
+    """NumPy backed stand-in for the rgbmatrix FrameCanvas"""
+
+
+class RGBMatrix(object):
+    """Hardware-free RGBMatrix that swaps between two FrameCanvases"""
+
+    def __init__(self, rows=0, chains=0, parallel=0, options: RGBMatrixOptions = None):
+        if options is None:
+            options = RGBMatrixOptions()
+            options.rows = rows or options.rows
+            options.chain_length = chains or options.chain_length
+            options.parallel = parallel or options.parallel
+
+        self.options = options
+        self.width = options.cols * options.chain_length
+        self.height = options.rows * options.parallel
+        self.brightness = options.brightness
+        self.frames = 0
+        self._front = FrameCanvas(self.width, self.height)
+
+    def CreateFrameCanvas(self) -> FrameCanvas:
+        return FrameCanvas(self.width, self.height)
+
+    def SwapOnVSync(self, canvas: FrameCanvas, framerate_fraction: int = 1):
+        previous = self._front
+        self._front = canvas
+        self.frames += 1
+        return previous
+
+    @property
+    def front(self) -> FrameCanvas:
+        """The canvas currently 'on the panel'"""
+        return self._front
+
+    def Clear(self) -> None:
+        self._front.Clear()
+
+    def Fill(self, red: int, green: int, blue: int) -> None:
+        self._front.Fill(red, green, blue)
+
+    def SetPixel(self, x: int, y: int, red: int, green: int, blue: int) -> None:
+        self._front.SetPixel(x, y, red, green, blue)
+
+    def SetImage(self, image: Image.Image, offset_x=0, offset_y=0, unsafe=True):
+        self._front.SetImage(image, offset_x, offset_y, unsafe)
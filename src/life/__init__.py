@@ -0,0 +1,37 @@
+from life.cycles import CycleDetector
+from life.engine import Engine
+from life.dense import DenseEngine
+from life.hashlife import HashlifeEngine
+from life.patterns import (
+    Pattern,
+    PatternLibrary,
+    parse_life106,
+    parse_rle,
+    pattern_library,
+)
+from life.rules import CONWAY_RULE, Rule, parse_rule
+from life.sparse import SparseEngine
+from life.striped import StripedEngine
+from life.simulation import LifeFrame, Settings, Simulation
+from life.worker import SimulationWorker
+
+__all__ = [
+    "CycleDetector",
+    "DenseEngine",
+    "Engine",
+    "HashlifeEngine",
+    "LifeFrame",
+    "Pattern",
+    "PatternLibrary",
+    "Settings",
+    "Simulation",
+    "SimulationWorker",
+    "SparseEngine",
+    "StripedEngine",
+    "CONWAY_RULE",
+    "Rule",
+    "parse_life106",
+    "parse_rle",
+    "parse_rule",
+    "pattern_library",
+]
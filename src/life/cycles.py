@@ -0,0 +1,47 @@
+from collections import deque
+from hashlib import blake2b
+
+import numpy as np
+
+from constants import CYCLE_MAX_PERIOD
+
+
+class CycleDetector(object):
+    """Spots a grid that has settled into still lifes and oscillators.
+
+    Every generation is reduced to an 8 byte digest of its packed cells and
+    the last max_period digests are kept, so a repeat within them gives the
+    period. A still life has period 1.
+    """
+
+    def __init__(self, max_period: int = CYCLE_MAX_PERIOD) -> None:
+        self.max_period = max_period
+        self._history: deque[tuple[int, bytes]] = deque(maxlen=max_period)
+        self.period = 0
+        # the generation the repeat was seen on
+        self.generation = 0
+
+    def reset(self) -> None:
+        """Forget the history, for when the grid changes other than by a step"""
+        self._history.clear()
+        self.period = 0
+        self.generation = 0
+
+    def digest(self, cells: np.ndarray) -> bytes:
+        # dying states of Generations rules need the whole byte
+        packed = cells if cells.max(initial=0) > 1 else np.packbits(cells)
+        return blake2b(packed, digest_size=8).digest()
+
+    def update(self, generation: int, cells: np.ndarray) -> int:
+        """Add a generation, returns the period once the grid repeats"""
+        if self.period:
+            return self.period
+
+        digest = self.digest(cells)
+        for seen_generation, seen in self._history:
+            if seen == digest:
+                self.period = generation - seen_generation
+                self.generation = generation
+                break
+        self._history.append((generation, digest))
+        return self.period
@@ -0,0 +1,108 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from life.rules import CONWAY_RULE, Rule
+
+
+def overlap(
+    left: int,
+    top: int,
+    shape: tuple,
+    other_left: int,
+    other_top: int,
+    other_shape: tuple,
+):
+    """Slices of two blocks at (left, top) and (other_left, other_top) that
+    cover the same cells, or (None, None) if they don't touch"""
+    x0, y0 = max(left, other_left), max(top, other_top)
+    x1 = min(left + shape[1], other_left + other_shape[1])
+    y1 = min(top + shape[0], other_top + other_shape[0])
+    if x0 >= x1 or y0 >= y1:
+        return None, None
+    return (
+        np.s_[y0 - top : y1 - top, x0 - left : x1 - left],
+        np.s_[y0 - other_top : y1 - other_top, x0 - other_left : x1 - other_left],
+    )
+
+
+class Engine(ABC):
+    """A Game of Life universe the view can step and look into.
+
+    Coordinates are cells with y going down, (0, 0) is the top left of the
+    grid the view seeds.
+    """
+
+    # bounded engines have a fixed grid, the view doesn't need to pan
+    bounded: bool = True
+
+    def __init__(self, rule: Rule = CONWAY_RULE) -> None:
+        self.generation = 0
+        self.rule: Rule = None
+        self.set_rule(rule)
+
+    @classmethod
+    def supports(cls, rule: Rule) -> bool:
+        return True
+
+    @abstractmethod
+    def set_rule(self, rule: Rule) -> None:
+        """Step with a different rule from now on"""
+        pass
+
+    @property
+    @abstractmethod
+    def population(self) -> int:
+        pass
+
+    @abstractmethod
+    def step(self, generations: int = 1) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Kill every cell and start again from generation 0"""
+        pass
+
+    @abstractmethod
+    def add(self, cells: np.ndarray, left: int = 0, top: int = 0) -> None:
+        """Set cells to their state in cells where it isn't 0, others are
+        left alone"""
+        pass
+
+    def place(self, cells: np.ndarray, left: int = 0, top: int = 0) -> None:
+        """Bring the cells at the x, y rows of an (n, 2) array to life, moved
+        by (left, top), without building a grid of the dead ones where the
+        engine can"""
+        if not len(cells):
+            return
+        xs, ys = cells[:, 0], cells[:, 1]
+        x, y = int(xs.min()), int(ys.min())
+        block = np.zeros((int(ys.max()) - y + 1, int(xs.max()) - x + 1), np.uint8)
+        block[ys - y, xs - x] = 1
+        self.add(block, left + x, top + y)
+
+    @abstractmethod
+    def window(self, left: int, top: int, out: np.ndarray) -> np.ndarray:
+        """Copy the cells under out, with its top left at (left, top)"""
+        pass
+
+    @abstractmethod
+    def get_state(self):
+        """The universe and generation, for set_state() to go back to.
+        Anything kept only to step faster is left out"""
+        pass
+
+    @abstractmethod
+    def set_state(self, state) -> None:
+        pass
+
+    def close(self) -> None:
+        """Let go of anything the engine started, it won't be stepped again"""
+        pass
+
+    @abstractmethod
+    def focus(self, width: int, height: int) -> tuple[float, float]:
+        """Where to center a width x height view to see the most activity,
+        None if nothing is alive"""
+        pass
@@ -0,0 +1,485 @@
+import numpy as np
+
+from constants import HASHLIFE_MAX_NODES
+from life.engine import Engine, overlap
+from life.rules import CONWAY_RULE, Rule
+
+# nodes this small also keep their cells as an array for reading and pasting
+BLOCK_LEVEL = 4
+# bit of each cell in a 4x4 block's code, row by row
+CODE_BITS = (1 << np.arange(16)).reshape(4, 4)
+
+
+class Node(object):
+    """A square of 2**level cells split into four quadrants.
+
+    Nodes are canonical, the same quadrants always make the same node, so a
+    pattern that shows up in many places or generations is only stored and
+    stepped once. A leaf (level 0) is one cell.
+    """
+
+    __slots__ = (
+        "level",
+        "nw",
+        "ne",
+        "sw",
+        "se",
+        "population",
+        "moment",
+        "next",
+        "block",
+    )
+
+    def __init__(self, level: int, nw=None, ne=None, sw=None, se=None) -> None:
+        self.level = level
+        self.nw: Node = nw
+        self.ne: Node = ne
+        self.sw: Node = sw
+        self.se: Node = se
+        self.population = 0
+        # sums of the live cells' x and y from the top left, for centroids
+        self.moment = (0, 0)
+        # step exponent: the center advanced 2**step generations
+        self.next: dict[int, Node] = {}
+        self.block: np.ndarray = None
+
+        if level > 0:
+            half = 1 << (level - 1)
+            self.population = (
+                nw.population + ne.population + sw.population + se.population
+            )
+            self.moment = (
+                nw.moment[0]
+                + ne.moment[0]
+                + sw.moment[0]
+                + se.moment[0]
+                + (ne.population + se.population) * half,
+                nw.moment[1]
+                + ne.moment[1]
+                + sw.moment[1]
+                + se.moment[1]
+                + (sw.population + se.population) * half,
+            )
+
+
+class HashlifeEngine(Engine):
+    """Gosper's Hashlife, a memoized quadtree over an unbounded universe.
+
+    Stepping a node reuses every result already worked out for an identical
+    node, so repetitive patterns can be jumped 2**k generations in about the
+    time of one. Nodes are kept in a canonical table that is rebuilt from the
+    live tree when it grows past max_nodes, which drops the stepping cache
+    and anything no longer part of the universe.
+
+    Only 2 state rules without B0 work, anything else can't be stepped one
+    node at a time.
+    """
+
+    bounded = False
+
+    def __init__(
+        self, rule: Rule = CONWAY_RULE, max_nodes: int = HASHLIFE_MAX_NODES
+    ) -> None:
+        self.max_nodes = max_nodes
+        self.clear()
+        super().__init__(rule)
+
+    @classmethod
+    def supports(cls, rule: Rule) -> bool:
+        return rule.is_life_like and 0 not in rule.birth
+
+    def set_rule(self, rule: Rule) -> None:
+        if not self.supports(rule):
+            raise ValueError(f"Hashlife can't step {rule.notation}")
+        changed = self.rule is not None and rule != self.rule
+        self.rule = rule
+        if changed:
+            # steps worked out with the old rule are wrong now
+            self.collect()
+
+    @property
+    def population(self) -> int:
+        return self.root.population
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    def clear(self) -> None:
+        self._nodes: dict[tuple[Node, Node, Node, Node], Node] = {}
+        # 4x4 blocks by code
+        self._blocks: dict[int, Node] = {}
+        self._off = Node(0)
+        self._on = Node(0)
+        self._on.population = 1
+        self._empty = [self._off]
+        self.root = self.empty(3)
+        # where the root's top left cell is in the universe
+        self.left = 0
+        self.top = 0
+        self.generation = 0
+
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw.level + 1, nw, ne, sw, se)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, level: int) -> Node:
+        while len(self._empty) <= level:
+            empty = self._empty[-1]
+            self._empty.append(self.join(empty, empty, empty, empty))
+        return self._empty[level]
+
+    def inner(self, node: Node) -> Node:
+        """The middle half of a node, one level down"""
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def centre(self, node: Node) -> Node:
+        """The node in the middle of an empty one, one level up"""
+        empty = self.empty(node.level - 1)
+        return self.join(
+            self.join(empty, empty, empty, node.nw),
+            self.join(empty, empty, node.ne, empty),
+            self.join(empty, node.sw, empty, empty),
+            self.join(node.se, empty, empty, empty),
+        )
+
+    def _grow(self) -> None:
+        self.left -= 1 << (self.root.level - 1)
+        self.top -= 1 << (self.root.level - 1)
+        self.root = self.centre(self.root)
+
+    def _is_padded(self, node: Node) -> bool:
+        """True when every live cell is in the middle half of the node"""
+        return self.inner(node).population == node.population
+
+    def cells_of(self, node: Node) -> np.ndarray:
+        """A small node as a uint8 array, kept on the node"""
+        if node.block is None:
+            if node.level == 0:
+                node.block = np.full((1, 1), node.population, dtype=np.uint8)
+            else:
+                node.block = np.block(
+                    [
+                        [self.cells_of(node.nw), self.cells_of(node.ne)],
+                        [self.cells_of(node.sw), self.cells_of(node.se)],
+                    ]
+                )
+        return node.block
+
+    def block_node(self, code: int) -> Node:
+        """The 4x4 node with the cells set in code's bits alive"""
+        node = self._blocks.get(code)
+        if node is None:
+            leaves = [self._on if code >> bit & 1 else self._off for bit in range(16)]
+            node = self.join(
+                self.join(leaves[0], leaves[1], leaves[4], leaves[5]),
+                self.join(leaves[2], leaves[3], leaves[6], leaves[7]),
+                self.join(leaves[8], leaves[9], leaves[12], leaves[13]),
+                self.join(leaves[10], leaves[11], leaves[14], leaves[15]),
+            )
+            self._blocks[code] = node
+        return node
+
+    def from_coords(self, xs: np.ndarray, ys: np.ndarray, level: int) -> Node:
+        """The node of 2**level cells with those at xs, ys from its top left
+        alive, built a level at a time from the 4x4 blocks that have any"""
+        if not xs.size:
+            return self.empty(level)
+
+        xs = xs.astype(np.int64)
+        ys = ys.astype(np.int64)
+        keys, index = np.unique((ys >> 2) << 32 | xs >> 2, return_inverse=True)
+        codes = np.zeros(keys.size, dtype=np.int64)
+        np.bitwise_or.at(codes, index, 1 << ((ys & 3) * 4 + (xs & 3)))
+        nodes = [self.block_node(int(code)) for code in codes]
+
+        for node_level in range(3, level + 1):
+            bx, by = keys & 0xFFFFFFFF, keys >> 32
+            quadrants = (by & 1) * 2 + (bx & 1)
+            keys, index = np.unique((by >> 1) << 32 | bx >> 1, return_inverse=True)
+            empty = self.empty(node_level - 1)
+            children = [[empty] * 4 for _ in range(keys.size)]
+            for node, parent, quadrant in zip(
+                nodes, index.tolist(), quadrants.tolist()
+            ):
+                children[parent][quadrant] = node
+            nodes = [self.join(*quads) for quads in children]
+        return nodes[0]
+
+    def union(self, a: Node, b: Node) -> Node:
+        """The node alive wherever either of two the same size is"""
+        if not b.population or a is b:
+            return a
+        if not a.population:
+            return b
+        if a.level == 0:
+            return self._on
+        return self.join(
+            self.union(a.nw, b.nw),
+            self.union(a.ne, b.ne),
+            self.union(a.sw, b.sw),
+            self.union(a.se, b.se),
+        )
+
+    def from_cells(self, cells: np.ndarray) -> Node:
+        """The node for a square uint8 array at least 4 cells wide"""
+        size = cells.shape[0]
+        if size == 4:
+            return self.block_node(int((cells * CODE_BITS).sum()))
+
+        if not cells.any():
+            return self.empty(size.bit_length() - 1)
+
+        half = size // 2
+        return self.join(
+            self.from_cells(cells[:half, :half]),
+            self.from_cells(cells[:half, half:]),
+            self.from_cells(cells[half:, :half]),
+            self.from_cells(cells[half:, half:]),
+        )
+
+    def _life_4x4(self, node: Node) -> Node:
+        """The middle 2x2 of a 4x4 node one generation on"""
+        cells = self.cells_of(node)
+        table = self.rule.table
+        leaves = []
+        for y in (1, 2):
+            for x in (1, 2):
+                alive = cells[y, x]
+                neighbors = int(cells[y - 1 : y + 2, x - 1 : x + 2].sum()) - alive
+                leaves.append(self._on if table[alive, neighbors] else self._off)
+        return self.join(*leaves)
+
+    def successor(self, node: Node, step: int) -> Node:
+        """The middle half of a node advanced 2**step generations.
+
+        step can be at most node.level - 2, the furthest a change can travel
+        before it would need cells from outside the node.
+        """
+        if node.population == 0:
+            return node.nw
+
+        result = node.next.get(step)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            # nine overlapping nodes one level down covering the node
+            parts = [
+                nw,
+                self.join(nw.ne, ne.nw, nw.se, ne.sw),
+                ne,
+                self.join(nw.sw, nw.se, sw.nw, sw.ne),
+                self.join(nw.se, ne.sw, sw.ne, se.nw),
+                self.join(ne.sw, ne.se, se.nw, se.ne),
+                sw,
+                self.join(sw.ne, se.nw, sw.se, se.sw),
+                se,
+            ]
+            full_step = step == node.level - 2
+            # a full step is two half steps, otherwise the nine take the whole step
+            part_step = step - 1 if full_step else step
+            c = [self.successor(part, part_step) for part in parts]
+            quads = [
+                self.join(c[0], c[1], c[3], c[4]),
+                self.join(c[1], c[2], c[4], c[5]),
+                self.join(c[3], c[4], c[6], c[7]),
+                self.join(c[4], c[5], c[7], c[8]),
+            ]
+            if full_step:
+                result = self.join(*[self.successor(q, part_step) for q in quads])
+            else:
+                result = self.join(*[self.inner(q) for q in quads])
+
+        node.next[step] = result
+        return result
+
+    def _advance(self, step: int) -> None:
+        """Move the universe on 2**step generations"""
+        while self.root.level < step + 2 or not self._is_padded(self.root):
+            self._grow()
+        # room for the pattern to spread as far as it can in that time
+        self._grow()
+        quarter = 1 << (self.root.level - 2)
+        self.root = self.successor(self.root, step)
+        self.left += quarter
+        self.top += quarter
+
+    def _trim(self) -> None:
+        """Drop empty border so the root stays as small as the pattern"""
+        while self.root.level > 3 and self._is_padded(self.inner(self.root)):
+            quarter = 1 << (self.root.level - 2)
+            self.root = self.inner(self.root)
+            self.left += quarter
+            self.top += quarter
+
+    def step(self, generations: int = 1) -> None:
+        self.generation += generations
+        if self.root.population == 0:
+            return
+
+        step = 0
+        while generations:
+            if generations & 1:
+                self._advance(step)
+            generations >>= 1
+            step += 1
+        self._trim()
+
+        if len(self._nodes) > self.max_nodes:
+            self.collect()
+
+    def _rebuild(self, node: Node, rebuilt: dict[Node, Node]) -> Node:
+        if node.level == 0:
+            return node
+        new = rebuilt.get(node)
+        if new is None:
+            new = self.join(
+                self._rebuild(node.nw, rebuilt),
+                self._rebuild(node.ne, rebuilt),
+                self._rebuild(node.sw, rebuilt),
+                self._rebuild(node.se, rebuilt),
+            )
+            rebuilt[node] = new
+        return new
+
+    def collect(self) -> None:
+        """Keep only the nodes the universe is made of, and no step results"""
+        root = self.root
+        self._nodes = {}
+        self._blocks = {}
+        self._empty = [self._off]
+        self.root = self._rebuild(root, {})
+
+    def _paste(
+        self, node: Node, x: int, y: int, cells: np.ndarray, left: int, top: int
+    ):
+        size = 1 << node.level
+        mine, theirs = overlap(x, y, (size, size), left, top, cells.shape)
+        if mine is None:
+            return node
+
+        if node.level == 2:
+            block = self.cells_of(node).copy()
+            np.bitwise_or(block[mine], cells[theirs], out=block[mine])
+            return self.from_cells(block)
+
+        half = size // 2
+        return self.join(
+            self._paste(node.nw, x, y, cells, left, top),
+            self._paste(node.ne, x + half, y, cells, left, top),
+            self._paste(node.sw, x, y + half, cells, left, top),
+            self._paste(node.se, x + half, y + half, cells, left, top),
+        )
+
+    def _cover(self, left: int, top: int, width: int, height: int) -> None:
+        """Grow the root until it takes in the width x height block at
+        (left, top)"""
+        while (
+            left < self.left
+            or top < self.top
+            or left + width > self.left + (1 << self.root.level)
+            or top + height > self.top + (1 << self.root.level)
+        ):
+            self._grow()
+
+    def add(self, cells: np.ndarray, left: int = 0, top: int = 0) -> None:
+        height, width = cells.shape
+        self._cover(left, top, width, height)
+        self.root = self._paste(self.root, self.left, self.top, cells, left, top)
+
+    def place(self, cells: np.ndarray, left: int = 0, top: int = 0) -> None:
+        if not len(cells):
+            return
+        xs = cells[:, 0].astype(np.int64) + left
+        ys = cells[:, 1].astype(np.int64) + top
+        x, y = int(xs.min()), int(ys.min())
+        self._cover(x, y, int(xs.max()) - x + 1, int(ys.max()) - y + 1)
+        node = self.from_coords(xs - self.left, ys - self.top, self.root.level)
+        self.root = self.union(self.root, node)
+
+    def _read(self, node: Node, x: int, y: int, out: np.ndarray, left: int, top: int):
+        if node.population == 0:
+            return
+
+        size = 1 << node.level
+        mine, theirs = overlap(x, y, (size, size), left, top, out.shape)
+        if mine is None:
+            return
+
+        if node.level <= BLOCK_LEVEL:
+            out[theirs] = self.cells_of(node)[mine]
+            return
+
+        half = size // 2
+        self._read(node.nw, x, y, out, left, top)
+        self._read(node.ne, x + half, y, out, left, top)
+        self._read(node.sw, x, y + half, out, left, top)
+        self._read(node.se, x + half, y + half, out, left, top)
+
+    def _live(self, node: Node, x: int, y: int, found: list[np.ndarray]) -> None:
+        if node.population == 0:
+            return
+
+        if node.level <= BLOCK_LEVEL:
+            ys, xs = np.nonzero(self.cells_of(node))
+            found.append(np.stack([xs + x, ys + y], axis=1))
+            return
+
+        half = 1 << (node.level - 1)
+        self._live(node.nw, x, y, found)
+        self._live(node.ne, x + half, y, found)
+        self._live(node.sw, x, y + half, found)
+        self._live(node.se, x + half, y + half, found)
+
+    def get_state(self):
+        # where the root is matters as well as the cells, focus() goes by
+        # the nodes they fall in
+        found = [np.empty((0, 2), dtype=np.int64)]
+        self._live(self.root, self.left, self.top, found)
+        cells = np.concatenate(found)
+        return cells, self.left, self.top, self.root.level, self.generation
+
+    def set_state(self, state) -> None:
+        cells, left, top, level, generation = state
+        self.clear()
+        self.left = left
+        self.top = top
+        self.root = self.from_coords(cells[:, 0] - left, cells[:, 1] - top, level)
+        self.generation = generation
+
+    def window(self, left: int, top: int, out: np.ndarray) -> np.ndarray:
+        out.fill(0)
+        self._read(self.root, self.left, self.top, out, left, top)
+        return out
+
+    def focus(self, width: int, height: int) -> tuple[float, float]:
+        """The centroid of the busiest node about the size of the view, so
+        gliders heading off in every direction don't drag it into space"""
+        node = self.root
+        if not node.population:
+            return None
+
+        x, y = self.left, self.top
+        size = max(width, height)
+        while node.level > 0 and (1 << (node.level - 1)) >= size:
+            half = 1 << (node.level - 1)
+            corners = (
+                (node.nw, 0, 0),
+                (node.ne, half, 0),
+                (node.sw, 0, half),
+                (node.se, half, half),
+            )
+            node, dx, dy = max(corners, key=lambda corner: corner[0].population)
+            x += dx
+            y += dy
+
+        moment_x, moment_y = node.moment
+        return x + moment_x / node.population, y + moment_y / node.population
@@ -0,0 +1,239 @@
+from dataclasses import dataclass
+from functools import cache
+import json
+import logging
+import os
+import re
+import tempfile
+
+import numpy as np
+
+from constants import PATTERNS_PATH, PATTERN_INDEX
+
+logger = logging.getLogger(__name__)
+
+RLE_SUFFIXES = (".rle",)
+LIFE_106_SUFFIXES = (".lif", ".life")
+LIFE_106_HEADER = "#Life 1.06"
+# x = 36, y = 9, rule = B3/S23
+RLE_HEADER = re.compile(r"^x\s*=\s*\d+\s*,\s*y\s*=\s*\d+(?:\s*,\s*rule\s*=\s*(\S+))?")
+# a run count and what it repeats, b or . is dead, $ ends a row, ! the pattern
+RLE_TOKEN = re.compile(r"(\d*)([a-zA-Z.$!])")
+
+
+@dataclass(frozen=True, eq=False)
+class Pattern:
+    """A named arrangement of live cells.
+
+    cells is an (n, 2) array of x, y from the top left of the pattern's
+    bounding box. rule is the notation the file gave, None if it didn't.
+    """
+
+    name: str
+    cells: np.ndarray
+    rule: str = None
+
+    @property
+    def width(self) -> int:
+        return int(self.cells[:, 0].max()) + 1 if len(self.cells) else 0
+
+    @property
+    def height(self) -> int:
+        return int(self.cells[:, 1].max()) + 1 if len(self.cells) else 0
+
+
+def _normalized(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """x, y pairs moved so the bounding box starts at 0, 0"""
+    cells = np.stack([xs, ys], axis=1).astype(np.int32).reshape(-1, 2)
+    if len(cells):
+        cells -= cells.min(axis=0)
+    return cells
+
+
+def parse_rle(text: str, name: str = None) -> Pattern:
+    """Pattern from run length encoded text, any state but dead is alive"""
+    rule = None
+    body = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("#"):
+            if line[1:2] == "N" and line[2:].strip():
+                name = line[2:].strip()
+            continue
+        header = RLE_HEADER.match(line)
+        if header:
+            rule = header.group(1)
+            continue
+        body.append(line)
+
+    # alive runs as a start x, a row and a length, expanded all at once below
+    starts, rows, lengths = [], [], []
+    x = y = 0
+    for count, tag in RLE_TOKEN.findall("".join(body)):
+        count = int(count) if count else 1
+        if tag == "!":
+            break
+        if tag == "$":
+            x = 0
+            y += count
+        elif tag in "b.":
+            x += count
+        else:
+            starts.append(x)
+            rows.append(y)
+            lengths.append(count)
+            x += count
+
+    lengths = np.array(lengths, dtype=np.int64)
+    # each cell's place in its run
+    offsets = np.arange(lengths.sum()) - np.repeat(
+        np.cumsum(lengths) - lengths, lengths
+    )
+    xs = np.repeat(np.array(starts, dtype=np.int64), lengths) + offsets
+    ys = np.repeat(np.array(rows, dtype=np.int64), lengths)
+    return Pattern(name=name, cells=_normalized(xs, ys), rule=rule)
+
+
+def parse_life106(text: str, name: str = None) -> Pattern:
+    """Pattern from Life 1.06 text, an x y pair per live cell"""
+    lines = []
+    for line in text.splitlines():
+        if line.startswith("#"):
+            if line[1:2] == "N" and line[2:].strip():
+                name = line[2:].strip()
+            continue
+        lines.append(line)
+
+    numbers = np.array(" ".join(lines).split(), dtype=np.int64)
+    if numbers.size % 2:
+        raise ValueError(f"{name} has an x without a y")
+    numbers = numbers.reshape(-1, 2)
+    return Pattern(name=name, cells=_normalized(numbers[:, 0], numbers[:, 1]))
+
+
+def read_pattern(path: str) -> Pattern:
+    """Pattern from an RLE or Life 1.06 file, named after the file unless it
+    names itself"""
+    stem, suffix = os.path.splitext(os.path.basename(path))
+    with open(path) as f:
+        text = f.read()
+    name = stem.replace("_", " ").replace("-", " ").title()
+    if suffix.lower() in LIFE_106_SUFFIXES or text.startswith(LIFE_106_HEADER):
+        return parse_life106(text, name)
+    return parse_rle(text, name)
+
+
+class PatternLibrary(object):
+    """Every pattern file in a directory, by name.
+
+    The parsed cells of all of them are kept in one index file, and only
+    files changed since it was written are parsed again, so starting up
+    reads one file and picking a pattern parses nothing.
+    """
+
+    def __init__(self, path: str = PATTERNS_PATH, index: str = PATTERN_INDEX):
+        self.path = path
+        self.index = index
+        self.patterns: dict[str, Pattern] = {}
+        self.load()
+
+    @property
+    def names(self) -> list[str]:
+        return sorted(self.patterns)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.patterns
+
+    def get(self, name: str) -> Pattern:
+        return self.patterns.get(name)
+
+    def files(self) -> list[str]:
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(
+            entry.name
+            for entry in os.scandir(self.path)
+            if entry.is_file()
+            and entry.name.lower().endswith(RLE_SUFFIXES + LIFE_106_SUFFIXES)
+        )
+
+    def read_index(self) -> dict[str, tuple[list, Pattern]]:
+        """Patterns in the index by file, with the file's stat when indexed"""
+        try:
+            with np.load(self.index) as index:
+                entries = json.loads(str(index["entries"]))
+                return {
+                    entry["file"]: (
+                        entry["stamp"],
+                        Pattern(entry["name"], index[f"cells_{i}"], entry["rule"]),
+                    )
+                    for i, entry in enumerate(entries)
+                }
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            # a write cut short leaves a truncated or empty zip, which np.load
+            # can fail on in any number of ways, it's rebuilt from the files
+            logger.warning(f"Ignoring unreadable pattern index {self.index}")
+            return {}
+
+    def write_index(self, patterns: dict[str, tuple[list, Pattern]]) -> None:
+        entries = []
+        arrays = {}
+        for i, (file, (stamp, pattern)) in enumerate(patterns.items()):
+            entries.append(
+                {
+                    "file": file,
+                    "stamp": stamp,
+                    "name": pattern.name,
+                    "rule": pattern.rule,
+                }
+            )
+            arrays[f"cells_{i}"] = pattern.cells
+        # written beside it and moved over it, so power going mid write
+        # leaves the old index rather than half of the new one
+        folder, name = os.path.split(self.index)
+        try:
+            fd, temp = tempfile.mkstemp(prefix=name, suffix=".tmp", dir=folder or ".")
+        except OSError:
+            logger.warning(f"Couldn't write pattern index {self.index}")
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, entries=np.array(json.dumps(entries)), **arrays)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp, self.index)
+        except OSError:
+            logger.warning(f"Couldn't write pattern index {self.index}")
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+
+    def load(self) -> None:
+        indexed = self.read_index()
+        patterns = {}
+        for file in self.files():
+            path = os.path.join(self.path, file)
+            stat = os.stat(path)
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            if file in indexed and indexed[file][0] == stamp:
+                patterns[file] = indexed[file]
+                continue
+            try:
+                patterns[file] = (stamp, read_pattern(path))
+            except (OSError, ValueError):
+                logger.exception(f"Couldn't read pattern {path}")
+
+        if patterns.keys() != indexed.keys() or any(
+            patterns[file] is not indexed[file] for file in patterns
+        ):
+            self.write_index(patterns)
+        self.patterns = {pattern.name: pattern for _, pattern in patterns.values()}
+
+
+@cache
+def pattern_library() -> PatternLibrary:
+    """The library in PATTERNS_PATH, loaded the first time it's needed"""
+    return PatternLibrary()
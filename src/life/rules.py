@@ -0,0 +1,80 @@
+from dataclasses import dataclass, field
+import re
+
+import numpy as np
+
+from constants import CONWAY, RULES
+
+# B3/S23, B2/S/C3 or B2/S/3
+BS_NOTATION = re.compile(r"^B(\d*)/S(\d*)(?:/C?(\d+))?$", re.IGNORECASE)
+# the older survival first form, 23/3 or /2/3
+SB_NOTATION = re.compile(r"^(\d*)/(\d*)(?:/(\d+))?$")
+NEIGHBORHOOD = 8
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A Life-like or Generations rule compiled to a lookup table.
+
+    State 0 is dead and 1 is alive, only live cells are counted as
+    neighbors. With more than 2 states a live cell that doesn't survive
+    counts up through the dying states back to dead, one per generation.
+    table[state, neighbors] is the cell's next state.
+    """
+
+    notation: str
+    birth: frozenset[int]
+    survival: frozenset[int]
+    states: int = 2
+    table: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        table = np.zeros((self.states, NEIGHBORHOOD + 1), dtype=np.uint8)
+        for count in self.birth:
+            table[0, count] = 1
+        dying = 2 if self.states > 2 else 0
+        table[1] = dying
+        for count in self.survival:
+            table[1, count] = 1
+        for state in range(2, self.states):
+            table[state] = (state + 1) % self.states
+        table.setflags(write=False)
+        object.__setattr__(self, "table", table)
+
+    @property
+    def is_life_like(self) -> bool:
+        return self.states == 2
+
+
+def _counts(digits: str, notation: str) -> frozenset[int]:
+    counts = frozenset(int(digit) for digit in digits)
+    if any(count > NEIGHBORHOOD for count in counts):
+        raise ValueError(f"'{notation}' has a neighbor count above {NEIGHBORHOOD}")
+    return counts
+
+
+def parse_rule(notation: str) -> Rule:
+    """Rule from B/S notation, with an optional state count for Generations"""
+    notation = notation.strip()
+    match = BS_NOTATION.match(notation)
+    if match:
+        birth, survival, states = match.groups()
+    else:
+        match = SB_NOTATION.match(notation)
+        if not match:
+            raise ValueError(f"'{notation}' is not a B/S or S/B rule")
+        survival, birth, states = match.groups()
+
+    states = int(states) if states else 2
+    if not 2 <= states <= np.iinfo(np.uint8).max // (NEIGHBORHOOD + 1):
+        raise ValueError(f"'{notation}' has {states} states")
+
+    return Rule(
+        notation=notation,
+        birth=_counts(birth, notation),
+        survival=_counts(survival, notation),
+        states=states,
+    )
+
+
+CONWAY_RULE = parse_rule(RULES[CONWAY])
@@ -0,0 +1,318 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from constants import (
+    GRID_MARGIN,
+    GRID_HEIGHT,
+    GRID_WIDTH,
+    RNG_RANGE,
+    INIT_CUTOFF,
+    ALIVE,
+    DEAD,
+    ALIVE_RGB,
+    DEAD_RGB,
+    ADD_NOISE,
+    RESET,
+    MAX_TICKS_PER_FRAME,
+    FAST_FORWARD,
+    FAST_FORWARD_POWER,
+    DENSE,
+    HASHLIFE,
+    STRIPED,
+    SPARSE,
+    VIEWPORT_EASE,
+    CYCLE_ACTIONS,
+    CYCLE_ACTION_GENERATIONS,
+    CONWAY,
+    RULES,
+    DYING_RGB,
+    RANDOM_PATTERN,
+)
+from frameclock import perf_counter
+from life.cycles import CycleDetector
+from life.dense import DenseEngine
+from life.engine import Engine
+from life.hashlife import HashlifeEngine
+from life.patterns import pattern_library
+from life.rules import Rule, parse_rule
+from life.sparse import SparseEngine
+from life.striped import StripedEngine
+
+
+@dataclass(frozen=True)
+class Settings:
+    """What the simulation is told to do, set from MQTT"""
+
+    seconds_per_tick: float
+    engine: str
+    rule: str
+    on_cycle: str
+    pattern: str
+
+
+@dataclass(frozen=True, eq=False)
+class LifeFrame:
+    """One published generation, nothing in it changes after it's made"""
+
+    pixels: np.ndarray
+    generation: int
+    population: int
+    period: int
+    period_generation: int
+
+
+class Simulation(object):
+    """A Game of Life run, everything but drawing it.
+
+    Holds the engine, rule, cycle detection and the viewport that follows
+    the activity, and steps on the seconds per tick schedule. Frames are
+    rendered at width x height for the panel.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.rng = np.random.default_rng()
+        # buffers reused for every reseed and step
+        self._random = np.empty((GRID_HEIGHT, GRID_WIDTH))
+        self._grid = np.empty((GRID_HEIGHT, GRID_WIDTH), dtype=np.uint8)
+        self._noise = np.empty((GRID_HEIGHT, GRID_WIDTH), dtype=np.uint8)
+        self._window = np.empty((height, width), dtype=np.uint8)
+        self.rules: dict[str, Rule] = {
+            name: parse_rule(notation) for name, notation in RULES.items()
+        }
+        self.rule_name = CONWAY
+        self.rule = self.rules[CONWAY]
+        # cell state to color lookup
+        self.palette = self.get_palette(self.rule.states)
+
+        self.library = pattern_library()
+        self.pattern_name = RANDOM_PATTERN
+        self.cycles = CycleDetector()
+        self.engine_name: str = None
+        self.engine: Engine = None
+        # universe cell at the panel's top left
+        self.viewport_x: float = GRID_MARGIN
+        self.viewport_y: float = GRID_MARGIN
+        self.set_engine(DENSE)
+        self.seed()
+        self.last_tick = perf_counter()
+
+    @property
+    def generation(self) -> int:
+        return self.engine.generation
+
+    def tick_due(self, seconds_per_tick: float) -> bool:
+        return perf_counter() - self.last_tick >= seconds_per_tick
+
+    def ticks_due(self, seconds_per_tick: float) -> int:
+        """Generations owed since the last tick, ticks faster than frames add up"""
+        if seconds_per_tick <= 0:
+            return 1
+        ticks = int((perf_counter() - self.last_tick) / seconds_per_tick)
+        return min(ticks, MAX_TICKS_PER_FRAME)
+
+    def until_tick(self, seconds_per_tick: float) -> float:
+        return max(0.0, self.last_tick + seconds_per_tick - perf_counter())
+
+    def new_random_grid(self, cutoff=INIT_CUTOFF, out: np.ndarray = None):
+        """Cells are alive where a random int in [0, RNG_RANGE) beats cutoff"""
+        if out is None:
+            out = self._grid
+
+        self.rng.random(out=self._random)
+        # same odds as the int compare without making the ints
+        np.greater_equal(self._random, (cutoff + 1) / RNG_RANGE, out=out)
+        return out
+
+    def get_palette(self, states: int) -> np.ndarray:
+        palette = np.empty((states, 3), dtype=np.uint8)
+        palette[DEAD] = DEAD_RGB
+        palette[ALIVE] = ALIVE_RGB
+        # dying states fade from DYING_RGB toward dead
+        fade = np.linspace(1.0, 0.0, states - 1)[:-1, np.newaxis]
+        palette[2:] = DEAD_RGB + (DYING_RGB - DEAD_RGB) * fade
+        return palette
+
+    def new_engine(self, name: str) -> Engine:
+        if name == HASHLIFE and HashlifeEngine.supports(self.rule):
+            return HashlifeEngine(self.rule)
+        if name == SPARSE and SparseEngine.supports(self.rule):
+            return SparseEngine(self.rule)
+        if name == STRIPED:
+            return StripedEngine(GRID_WIDTH, GRID_HEIGHT, self.rule)
+        return DenseEngine(GRID_WIDTH, GRID_HEIGHT, self.rule)
+
+    def engine_for(self, name: str) -> str:
+        """The engine to run, dense for rules the chosen one can't step"""
+        if name == HASHLIFE and not HashlifeEngine.supports(self.rule):
+            return DENSE
+        if name == SPARSE and not SparseEngine.supports(self.rule):
+            return DENSE
+        return name
+
+    def set_engine(self, name: str) -> None:
+        """Switch engines, carrying over the grid around the viewport"""
+        engine = self.new_engine(name)
+        if self.engine is not None:
+            left, top = self.grid_origin
+            engine.add(self.engine.window(left, top, self._grid))
+            engine.generation = self.engine.generation
+            self.engine.close()
+        self.engine = engine
+        self.engine_name = name
+        self.reset_viewport()
+        self.cycles.reset()
+
+    def set_rule(self, name: str) -> None:
+        self.rule_name = name
+        self.rule = self.rules[name]
+        self.palette = self.get_palette(self.rule.states)
+        if self.engine.supports(self.rule):
+            self.engine.set_rule(self.rule)
+        else:
+            self.set_engine(DENSE)
+        self.cycles.reset()
+
+    @property
+    def grid_origin(self) -> tuple[int, int]:
+        """Top left of the grid's worth of cells around the viewport"""
+        return (
+            round(self.viewport_x) - GRID_MARGIN,
+            round(self.viewport_y) - GRID_MARGIN,
+        )
+
+    def reset_viewport(self) -> None:
+        self.viewport_x = GRID_MARGIN
+        self.viewport_y = GRID_MARGIN
+
+    def follow_activity(self) -> None:
+        """Pan part of the way toward the busiest part of the universe"""
+        if self.engine.bounded:
+            return
+
+        height, width = self._window.shape
+        focus = self.engine.focus(width, height)
+        if focus is None:
+            return
+
+        focus_x, focus_y = focus
+        self.viewport_x += (focus_x - width / 2 - self.viewport_x) * VIEWPORT_EASE
+        self.viewport_y += (focus_y - height / 2 - self.viewport_y) * VIEWPORT_EASE
+
+    def seed(self) -> None:
+        """Start again from generation 0 with the pattern in the middle of
+        the grid, or random cells if there's no pattern by that name"""
+        self.engine.clear()
+        self.reset_viewport()
+        pattern = self.library.get(self.pattern_name)
+        if pattern is None:
+            self.engine.add(self.new_random_grid())
+        else:
+            left = (GRID_WIDTH - pattern.width) // 2
+            top = (GRID_HEIGHT - pattern.height) // 2
+            self.engine.place(pattern.cells, left, top)
+        self.cycles.reset()
+
+    def run_command(self, command: str) -> None:
+        if command == RESET:
+            self.seed()
+        elif command == ADD_NOISE:
+            noise = self.new_random_grid(cutoff=95, out=self._noise)
+            self.engine.add(noise, *self.grid_origin)
+        elif command == FAST_FORWARD:
+            self.engine.step(2**FAST_FORWARD_POWER)
+            self.follow_activity()
+        else:
+            return
+        # the grid changed without stepping, so any cycle seen is gone
+        self.cycles.reset()
+
+    def apply(self, settings: Settings) -> bool:
+        """Switch to the rule, engine and pattern in settings, True if any
+        changed. A new pattern starts over, run with the chosen rule"""
+        changed = False
+        if settings.rule != self.rule_name:
+            self.set_rule(settings.rule)
+            changed = True
+        engine_name = self.engine_for(settings.engine)
+        if engine_name != self.engine_name:
+            self.set_engine(engine_name)
+            changed = True
+        if settings.pattern != self.pattern_name:
+            self.pattern_name = settings.pattern
+            self.seed()
+            changed = True
+        return changed
+
+    def tick(self, generations: int = 1, seconds_per_tick: float = 0.0):
+        # a generation at a time until it repeats so every one is checked
+        remaining = generations
+        while remaining and not self.cycles.period:
+            self.engine.step()
+            remaining -= 1
+            self.cycles.update(
+                self.generation, self.engine.window(*self.grid_origin, self._grid)
+            )
+        if remaining:
+            self.engine.step(remaining)
+        self.follow_activity()
+        # stay on schedule so part of a tick left over carries to the next
+        self.last_tick += generations * seconds_per_tick
+        now = perf_counter()
+        if now - self.last_tick >= seconds_per_tick:
+            # capped or not ticking on a schedule, drop the backlog
+            self.last_tick = now
+
+    def advance(self, settings: Settings) -> bool:
+        """Step if a tick is due and act on a settled grid, True if it changed"""
+        changed = False
+        seconds_per_tick = settings.seconds_per_tick
+        if self.tick_due(seconds_per_tick):
+            self.tick(self.ticks_due(seconds_per_tick), seconds_per_tick)
+            changed = True
+
+        action = CYCLE_ACTIONS.get(settings.on_cycle)
+        if action is not None and self.cycles.period:
+            # leave the settled grid up for a while before acting on it
+            settled_for = self.generation - self.cycles.generation
+            if settled_for >= CYCLE_ACTION_GENERATIONS:
+                self.run_command(action)
+                changed = True
+        return changed
+
+    def get_state(self) -> dict:
+        """Everything the run goes on from, for set_state() to pick up from"""
+        return {
+            "rng": self.rng.bit_generator.state,
+            "rule": self.rule_name,
+            "engine": self.engine_name,
+            "pattern": self.pattern_name,
+            "universe": self.engine.get_state(),
+            "viewport": (self.viewport_x, self.viewport_y),
+            "last_tick": self.last_tick,
+            "cycles": self.cycles,
+        }
+
+    def set_state(self, state: dict) -> None:
+        self.rng.bit_generator.state = state["rng"]
+        if state["rule"] != self.rule_name:
+            self.set_rule(state["rule"])
+        if state["engine"] != self.engine_name:
+            self.set_engine(state["engine"])
+        self.pattern_name = state["pattern"]
+        self.engine.set_state(state["universe"])
+        self.viewport_x, self.viewport_y = state["viewport"]
+        self.last_tick = state["last_tick"]
+        self.cycles = state["cycles"]
+
+    def frame(self) -> LifeFrame:
+        cells = self.engine.window(
+            round(self.viewport_x), round(self.viewport_y), self._window
+        )
+        return LifeFrame(
+            pixels=np.take(self.palette, cells, axis=0),
+            generation=self.generation,
+            population=self.engine.population,
+            period=self.cycles.period,
+            period_generation=self.cycles.generation,
+        )
@@ -0,0 +1,127 @@
+import numpy as np
+
+from life.engine import Engine
+from life.rules import CONWAY_RULE, Rule
+
+# a cell is one int64, its row in the high half and column in the low half,
+# both moved by BIAS so negative coordinates sort in order, which leaves room
+# for a universe 2**31 cells across
+SHIFT = 32
+BIAS = 1 << 30
+COLUMN = (1 << SHIFT) - 1
+ROW = 1 << SHIFT
+NEIGHBOR_OFFSETS = np.array(
+    [-ROW - 1, -ROW, -ROW + 1, -1, 1, ROW - 1, ROW, ROW + 1], dtype=np.int64
+)
+
+
+def pack(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    xs = np.asarray(xs, dtype=np.int64)
+    ys = np.asarray(ys, dtype=np.int64)
+    return (ys + BIAS) << SHIFT | (xs + BIAS)
+
+
+def unpack(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return (keys & COLUMN) - BIAS, (keys >> SHIFT) - BIAS
+
+
+class SparseEngine(Engine):
+    """Only the live cells, as a sorted array of packed coordinates, in an
+    unbounded universe.
+
+    Each generation spreads every live cell onto its eight neighbors and
+    counts how often each cell turns up, so stepping costs the population
+    and not the area. Guns and spaceships on a mostly empty board step far
+    faster than on a grid, without Hashlife's memory for nodes it has little
+    chance to reuse.
+
+    Only 2 state rules without B0 work, a dead cell with no live neighbors
+    is never looked at.
+    """
+
+    bounded = False
+
+    def __init__(self, rule: Rule = CONWAY_RULE) -> None:
+        self.clear()
+        super().__init__(rule)
+
+    @classmethod
+    def supports(cls, rule: Rule) -> bool:
+        return rule.is_life_like and 0 not in rule.birth
+
+    def set_rule(self, rule: Rule) -> None:
+        if not self.supports(rule):
+            raise ValueError(f"The sparse engine can't step {rule.notation}")
+        self.rule = rule
+
+    @property
+    def population(self) -> int:
+        return int(self.keys.size)
+
+    def clear(self) -> None:
+        self.keys = np.empty(0, dtype=np.int64)
+        self.generation = 0
+
+    def get_state(self):
+        # keys are replaced by every change, never written to
+        return self.keys, self.generation
+
+    def set_state(self, state) -> None:
+        self.keys, self.generation = state
+
+    def add(self, cells: np.ndarray, left: int = 0, top: int = 0) -> None:
+        ys, xs = np.nonzero(cells)
+        self.keys = np.union1d(self.keys, pack(xs + left, ys + top))
+
+    def place(self, cells: np.ndarray, left: int = 0, top: int = 0) -> None:
+        keys = pack(cells[:, 0] + left, cells[:, 1] + top)
+        self.keys = np.union1d(self.keys, keys)
+
+    def next_keys(self, keys: np.ndarray) -> np.ndarray:
+        table = self.rule.table
+        spread = (keys[:, np.newaxis] + NEIGHBOR_OFFSETS).ravel()
+        cells, counts = np.unique(spread, return_counts=True)
+        # both sorted, so a search finds which of them are alive now
+        found = np.searchsorted(keys, cells).clip(max=keys.size - 1)
+        alive = (keys[found] == cells).view(np.uint8)
+        next_keys = cells[table[alive, counts] == 1]
+        if table[1, 0]:
+            # live cells with no live neighbors weren't spread onto
+            lonely = np.setdiff1d(keys, cells, assume_unique=True)
+            next_keys = np.union1d(next_keys, lonely)
+        return next_keys
+
+    def step(self, generations: int = 1) -> None:
+        self.generation += generations
+        for _ in range(generations):
+            if not self.keys.size:
+                break
+            self.keys = self.next_keys(self.keys)
+
+    def window(self, left: int, top: int, out: np.ndarray) -> np.ndarray:
+        out.fill(0)
+        height, width = out.shape
+        # keys sort by row, so the window's rows are one slice
+        first, last = np.searchsorted(
+            self.keys, [pack(left, top), pack(left, top + height)]
+        )
+        xs, ys = unpack(self.keys[first:last])
+        xs -= left
+        ys -= top
+        inside = (xs >= 0) & (xs < width)
+        out[ys[inside], xs[inside]] = 1
+        return out
+
+    def focus(self, width: int, height: int) -> tuple[float, float]:
+        """The centroid of the busiest view sized block, so gliders heading
+        off in every direction don't drag it into space"""
+        if not self.keys.size:
+            return None
+
+        size = max(width, height)
+        xs, ys = unpack(self.keys)
+        blocks, index, counts = np.unique(
+            pack(xs // size, ys // size), return_inverse=True, return_counts=True
+        )
+        busiest = index == counts.argmax()
+        return xs[busiest].mean(), ys[busiest].mean()
@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from constants import STRIPE_MIN_ROWS, STRIPED_WORKERS
+from life.dense import DenseEngine, Stripe
+from life.rules import CONWAY_RULE, Rule
+
+
+class StripedEngine(DenseEngine):
+    """A DenseEngine that steps horizontal stripes of the grid in parallel.
+
+    Every stripe reads the shared front buffer, where the rows either side of
+    it act as its halo, and writes only its own rows of the back buffer, so
+    stripes never wait on each other until the buffers are swapped. NumPy
+    lets go of the GIL in its loops, so threads are enough to use every core.
+    Grids too short to give each worker STRIPE_MIN_ROWS rows use fewer
+    stripes, and a single stripe is stepped without the pool.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        rule: Rule = CONWAY_RULE,
+        workers: int = STRIPED_WORKERS,
+    ) -> None:
+        super().__init__(width, height, rule)
+        count = max(1, min(workers, height // STRIPE_MIN_ROWS))
+        edges = np.linspace(0, height, count + 1).astype(int)
+        self.stripes = [
+            Stripe(top, bottom, width) for top, bottom in zip(edges[:-1], edges[1:])
+        ]
+        self._executor: ThreadPoolExecutor = None
+        if count > 1:
+            self._executor = ThreadPoolExecutor(
+                max_workers=count, thread_name_prefix="life-stripe"
+            )
+
+    @property
+    def workers(self) -> int:
+        return len(self.stripes)
+
+    def step(self, generations: int = 1) -> None:
+        if self._executor is None:
+            super().step(generations)
+            return
+
+        for _ in range(generations):
+            # the generation has to finish everywhere before the swap
+            for future in [
+                self._executor.submit(self.step_stripe, stripe)
+                for stripe in self.stripes
+            ]:
+                future.result()
+            self.swap()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,95 @@
+import logging
+from queue import Queue
+from threading import Event, Thread
+
+from constants import TARGET_FPS
+from life.simulation import LifeFrame, Settings, Simulation
+
+logger = logging.getLogger(__name__)
+
+
+class SimulationWorker(Thread):
+    """Steps a Simulation on its own thread at the seconds per tick.
+
+    Each generation is published as a new LifeFrame that is never written
+    again, so handing it to the renderer is one reference swap and neither
+    side takes a lock. Commands and settings go the other way through a
+    queue and a reference, and wake the worker up.
+
+    A worker taking over a simulation from a stopped one waits for it to
+    finish its step on its own thread, so stopping never blocks the caller.
+    A command that fails is logged and dropped, anything else that fails
+    ends the worker.
+    """
+
+    def __init__(
+        self,
+        simulation: Simulation,
+        settings: Settings,
+        previous: "SimulationWorker" = None,
+    ) -> None:
+        super().__init__(name="life", daemon=True)
+        self.simulation = simulation
+        self.settings = settings
+        self.previous = previous
+        self.commands: Queue = Queue()
+        if previous is not None:
+            # the simulation may be mid step, don't read it until it's done
+            self.latest: LifeFrame = previous.latest
+        else:
+            self.latest = simulation.frame()
+        self.is_running = True
+        self._wake = Event()
+
+    def submit(self, command: str) -> None:
+        self.commands.put(command)
+        self._wake.set()
+
+    def update(self, settings: Settings) -> None:
+        if settings != self.settings:
+            self.settings = settings
+            self._wake.set()
+
+    def stop(self) -> None:
+        self.is_running = False
+        self._wake.set()
+
+    def run_commands(self) -> bool:
+        """Run every queued command, True if any ran"""
+        changed = False
+        while not self.commands.empty():
+            command = self.commands.get_nowait()
+            try:
+                self.simulation.run_command(command)
+            except Exception:
+                logger.exception(f"Game of Life command {command} failed")
+            changed = True
+        return changed
+
+    def run(self) -> None:
+        simulation = self.simulation
+        if self.previous is not None:
+            self.previous.join()
+            self.previous = None
+            self.latest = simulation.frame()
+
+        while self.is_running:
+            # cleared first so a wake up while stepping isn't lost
+            self._wake.clear()
+            settings = self.settings
+            try:
+                changed = self.run_commands()
+                changed |= simulation.apply(settings)
+                changed |= simulation.advance(settings)
+                if changed:
+                    self.latest = simulation.frame()
+            except Exception:
+                logger.exception("Game of Life simulation failed")
+                return
+
+            if settings.seconds_per_tick <= 0:
+                # as fast as the panel can show them
+                timeout = 1.0 / TARGET_FPS
+            else:
+                timeout = simulation.until_tick(settings.seconds_per_tick)
+            self._wake.wait(timeout)
@@ -1,15 +1,72 @@
 import logging
 from typing import Tuple
 
+import numpy as np
 from PIL import Image, ImageDraw
-from rgbmatrix.graphics import DrawText, Font
+from rgbmatrix.graphics import Font
 
 from constants.colors import BLACK, WHITE, ColorRGB
+from framebuffer import DrawText
 from utils.images import get_gradient_img, adjust_lightness
 
 logger = logging.getLogger(__name__)
 
 
+def _nanmean(values: np.ndarray) -> float:
+    valid = values[~np.isnan(values)]
+    return valid.mean() if valid.size else np.nan
+
+
+def downsample_lttb(values: np.ndarray, num_points: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets, keeps the shape of a long series.
+
+    The first and last samples are kept and every bucket between them keeps
+    the sample that makes the biggest triangle with the previously kept one
+    and the average of the next bucket. A bucket that is all NaN stays NaN
+    so gaps survive.
+    """
+    size = values.size
+    if num_points >= size:
+        return values
+    if num_points < 3:
+        return values[[0, -1]][:num_points]
+
+    result = np.empty(num_points)
+    result[0] = values[0]
+    result[-1] = values[-1]
+    # num_points - 2 buckets between the first and last samples
+    edges = np.linspace(1, size - 1, num_points - 1).astype(int)
+
+    anchor_x, anchor_y = 0, values[0]
+    for i in range(num_points - 2):
+        start, end = edges[i], edges[i + 1]
+        bucket = values[start:end]
+        bucket_mean = _nanmean(bucket)
+        if np.isnan(bucket_mean):
+            result[i + 1] = np.nan
+            continue
+
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else size
+        next_x = (next_start + next_end - 1) / 2
+        next_y = _nanmean(values[next_start:next_end])
+        if np.isnan(next_y):
+            next_y = bucket_mean
+        if np.isnan(anchor_y):
+            anchor_y = bucket_mean
+
+        xs = np.arange(start, end)
+        area = np.abs(
+            (anchor_x - next_x) * (bucket - anchor_y)
+            - (anchor_x - xs) * (next_y - anchor_y)
+        )
+        picked = np.nanargmax(area)
+        result[i + 1] = bucket[picked]
+        anchor_x, anchor_y = xs[picked], bucket[picked]
+
+    return result
+
+
 class LineGraph(object):
     def __init__(
         self,
@@ -22,7 +79,10 @@ class LineGraph(object):
         background: Tuple[int, int, int] = BLACK.rgb,
     ) -> None:
         self.label: str = label
+        # replaced rather than changed in place, so it's matched by identity
         self.data: list[float] = data
+        # the newest sample, plotted after data without copying data to add it
+        self.live: float = None
         self.units: str = units
         self.round: int = round
         self.data_space: int = 3
@@ -32,40 +92,100 @@ class LineGraph(object):
         self.line_color: Tuple[int, int, int] = line_color
         self.fill_color: Tuple[int, int, int] = fill_color
         self.background: Tuple[int, int, int] = background
+        # longer series are downsampled to fit, None lets the graph grow
+        self.max_width: int = None
+        # the series worked out from data and live, and what it was from
+        self._series_key: tuple = None
+        self._series_version = 0
+        self._values: np.ndarray = None
+        self._plot_values: np.ndarray = None
+        self._last_value: float = None
+        # the last graph drawn and everything it was drawn from
+        self._graph_key: tuple = None
+        self._graph_pixels: np.ndarray = None
+
+    def _update_series(self) -> None:
+        """Work the series out again only if data, live or max_width changed"""
+        if self._series_key is not None:
+            data, live, max_width = self._series_key
+            if data is self.data and live == self.live and max_width == self.max_width:
+                return
+
+        values = np.array(self.data, dtype=float)
+        if self.live is not None:
+            values = np.append(values, self.live)
+        self._values = values
+        self._plot_values = None
+        valid = np.flatnonzero(~np.isnan(values))
+        if not valid.size:
+            self._last_value = None
+        elif valid[-1] == len(self.data):
+            self._last_value = self.live
+        else:
+            self._last_value = self.data[valid[-1]]
+        self._series_key = (self.data, self.live, self.max_width)
+        self._series_version += 1
+
+    @property
+    def num_points(self) -> int:
+        """How many samples are plotted, data_space pixels apart"""
+        num_points = self.values.size
+        if self.max_width is not None:
+            num_points = min(num_points, (self.max_width - 1) // self.data_space + 1)
+        return num_points
 
     @property
     def width(self) -> int:
-        return (len(self.data) - 1) * self.data_space + 1
+        return (self.num_points - 1) * self.data_space + 1
 
-    def get_scaled_data(self) -> list[int]:
-        scaled = []
-        non_zeros = [d for d in self.data if d != 0]
-        if not non_zeros:
-            return scaled
+    @property
+    def values(self) -> np.ndarray:
+        """data then live as floats, missing samples (None from HA) are NaN"""
+        self._update_series()
+        return self._values
 
-        min_val = min(non_zeros)
-        if self.fixed_min_val:
+    def get_plot_values(self) -> np.ndarray:
+        self._update_series()
+        if self._plot_values is None:
+            self._plot_values = downsample_lttb(self._values, self.num_points)
+        return self._plot_values
+
+    @property
+    def last_value(self) -> float:
+        self._update_series()
+        return self._last_value
+
+    def get_scaled_data(self) -> np.ndarray:
+        """Pixel heights for each plotted sample, NaN where one is missing"""
+        values = self.get_plot_values()
+        if np.isnan(values).all():
+            return np.full(values.shape, np.nan)
+
+        min_val = np.nanmin(values)
+        if self.fixed_min_val is not None:
             min_val = self.fixed_min_val
-        max_val = max(self.data)
-        if self.fixed_max_val:
+        max_val = np.nanmax(values)
+        if self.fixed_max_val is not None:
             max_val = self.fixed_max_val
+
+        values = np.clip(values, min_val, max_val)
         if max_val - min_val == 0:
-            return scaled
-
-        for d in self.data:
-            val = d
-            if d == 0:
-                val = min_val
-            if self.fixed_min_val and d < self.fixed_min_val:
-                val = self.fixed_min_val
-            if self.fixed_max_val and d > self.fixed_max_val:
-                val = self.fixed_max_val
-
-            val = round(
-                (val - min_val) / (max_val - min_val) * (self.height - 1)
-            )  # coords 0 based
-            scaled.append(val)
-        return scaled
+            return values - min_val
+
+        # coords 0 based
+        return np.round((values - min_val) / (max_val - min_val) * (self.height - 1))
+
+    def get_segments(self, scaled: np.ndarray) -> list[list[Tuple[int, int]]]:
+        """Points of each run of samples that aren't missing"""
+        xs = np.arange(scaled.size) * self.data_space
+        valid = ~np.isnan(scaled)
+        # indices where a run starts or ends
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], valid, [0]))))
+        segments = []
+        for start, end in zip(edges[::2], edges[1::2]):
+            ys = scaled[start:end].astype(int)
+            segments.append(list(zip(xs[start:end].tolist(), ys.tolist())))
+        return segments
 
     def get_graph_img(self, data: list[float] = None) -> Image.Image:
         if data is not None:
@@ -79,44 +199,52 @@ class LineGraph(object):
 
         draw = ImageDraw.Draw(img)
 
-        points: list[Tuple[int, int]] = []
-        x = 0
-        y = 0
-
-        points.append((x, y))
-        scaled = self.get_scaled_data()
-        for i, y in enumerate(scaled):
-            points.append((x, y))
-            if i < len(scaled) - 1:
-                x += self.data_space
-        points.append((x, 0))
-
-        draw.polygon(points, fill=self.fill_color)
-        # remove first and last points becase they
-        # are the front and back lines of the graph
-        points.pop(0)
-        points.pop()
-        # draw line on top of the polygon fill
-        draw.line(points, fill=self.line_color)
-        logger.debug(points)
+        for points in self.get_segments(self.get_scaled_data()):
+            # close the fill down to the bottom at both ends of the segment
+            first_x = points[0][0]
+            last_x = points[-1][0]
+            draw.polygon([(first_x, 0), *points, (last_x, 0)], fill=self.fill_color)
+            # draw line on top of the polygon fill
+            draw.line(points, fill=self.line_color)
+            logger.debug(points)
 
         # y coordinates are top to bottom in PIL images
         img = img.transpose(method=Image.Transpose.FLIP_TOP_BOTTOM)
 
         return img
 
+    def get_graph_pixels(self) -> np.ndarray:
+        """The graph image as an array, only redrawn when its inputs change"""
+        self._update_series()
+        key = (
+            self._series_version,
+            self.line_color,
+            self.fill_color,
+            self.background,
+            self.fixed_min_val,
+            self.fixed_max_val,
+            self.max_width,
+        )
+        if key != self._graph_key:
+            self._graph_pixels = np.asarray(self.get_graph_img())
+            self._graph_key = key
+        return self._graph_pixels
+
     def draw(self, canvas, font: Font, x: int, y: int, text_color: ColorRGB) -> None:
-        if not self.data:
+        if not self.values.size:
             return
 
         graph_x = x
         graph_y = y
-        img = self.get_graph_img()
-        if len(self.data) > 1:
-            canvas.SetImage(img, graph_x, graph_y)
+        pixels = self.get_graph_pixels()
+        if self.values.size > 1:
+            canvas.blit(pixels, graph_x, graph_y)
 
-        txt_x = img.width + 2
+        txt_x = pixels.shape[1] + 2
         txt_y = graph_y + self.height - 1
-        last_val = self.data[-1]
-        label = f"{self.label}: {round(last_val, self.round)}{self.units}"
+        last_val = self.last_value
+        if last_val is None:
+            label = f"{self.label}: --"
+        else:
+            label = f"{self.label}: {round(last_val, self.round)}{self.units}"
         DrawText(canvas, font, txt_x, txt_y, text_color, label)
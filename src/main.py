@@ -21,20 +21,26 @@ from rgbmatrix import RGBMatrix, RGBMatrixOptions
 
 import callbacks
 from constants import (
-    DEFAULT_VIEW,
     FAN_PIN,
     METERS_ABOVE_SEA_LEVEL,
     TEMPERATURE_OFFSET,
+    CYCLE_ACTIONS,
     FORECAST_TYPE,
+    LIFE_ENGINES,
+    RANDOM_PATTERN,
+    RULES,
     SECONDARY_TYPE,
     PANEL_WIDTH,
     PANEL_HEIGHT,
 )
 from data import Data
+from life import pattern_library
 from mqttdevice import MQTTDevice, Discoverable
+from recording import Recorder
+from renderthread import RenderThread
 
 from utils import get_mac_address
-from view import View, VIEWS
+from view import VIEWS
 
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + "/.."))
 
@@ -47,47 +53,6 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
-async def matrix_loop(matrix: RGBMatrix, data: Data):
-    logger.info("Init matrix loop")
-    canvas = matrix.CreateFrameCanvas()
-
-    view_names = [v for v in VIEWS.keys()]
-    logger.info(f"Init views: {','.join(view_names)}")
-    max_unexpected_errors = 5
-    unexpected_errors = 0
-    current_view: View = None
-    while data.is_running:
-        canvas.Clear()
-
-        if data.view not in VIEWS:
-            data.view = DEFAULT_VIEW
-
-        data_view = VIEWS[data.view]
-        if current_view is not data_view:
-            if current_view is not None:
-                current_view.unload()
-            data_view.load()
-
-        current_view = data_view
-        try:
-            await current_view.draw(canvas, data)
-            unexpected_errors = 0  # reset if we got here
-        except Exception as e:
-            if unexpected_errors >= max_unexpected_errors:
-                continue
-
-            logger.critical(f"Unexpected error drawing {data.view} view", exc_info=True)
-
-            unexpected_errors += 1
-            if unexpected_errors >= max_unexpected_errors:
-                logger.critical(
-                    f"Max errors ({max_unexpected_errors}) reached. The previous error will not be logged again until resolved or restarted."
-                )
-
-        canvas = matrix.SwapOnVSync(canvas)
-        await asyncio.sleep(0)
-
-
 async def air_loop(data: Data):
     logger.info("Init air sensors")
     sgp = SGP40(I2C)
@@ -291,6 +256,60 @@ async def mqtt_loop(data: Data):
         use_shared_topic=True,
     )
 
+    mqtt.add_button(
+        name="Game of Life Fast Forward",
+        unique_id="nowspinning_gol_fast_forward",
+        payload_press="FAST_FORWARD",
+        callback=callbacks.game_of_life_buttons,
+        icon="mdi:fast-forward",
+        availability_template="{{ value_json.gol_fast_forward.available }}",
+        use_shared_topic=True,
+    )
+
+    mqtt.add_select(
+        name="Game of Life Engine",
+        callback=callbacks.game_of_life_engine,
+        unique_id="nowspinning_gol_engine",
+        options=LIFE_ENGINES,
+        icon="mdi:engine",
+        value_template="{{ value_json.gol_engine.value }}",
+        availability_template="{{ value_json.gol_engine.available }}",
+        use_shared_topic=True,
+    )
+
+    mqtt.add_select(
+        name="Game of Life Rule",
+        callback=callbacks.game_of_life_rule,
+        unique_id="nowspinning_gol_rule",
+        options=list(RULES.keys()),
+        icon="mdi:script-text-outline",
+        value_template="{{ value_json.gol_rule.value }}",
+        availability_template="{{ value_json.gol_rule.available }}",
+        use_shared_topic=True,
+    )
+
+    mqtt.add_select(
+        name="Game of Life Pattern",
+        callback=callbacks.game_of_life_pattern,
+        unique_id="nowspinning_gol_pattern",
+        options=[RANDOM_PATTERN] + pattern_library().names,
+        icon="mdi:shape-outline",
+        value_template="{{ value_json.gol_pattern.value }}",
+        availability_template="{{ value_json.gol_pattern.available }}",
+        use_shared_topic=True,
+    )
+
+    mqtt.add_select(
+        name="Game of Life On Cycle",
+        callback=callbacks.game_of_life_on_cycle,
+        unique_id="nowspinning_gol_on_cycle",
+        options=list(CYCLE_ACTIONS.keys()),
+        icon="mdi:autorenew",
+        value_template="{{ value_json.gol_on_cycle.value }}",
+        availability_template="{{ value_json.gol_on_cycle.available }}",
+        use_shared_topic=True,
+    )
+
     mqtt.add_switch(
         name="Game of Life Show Gens",
         unique_id="nowspinning_gol_show_gens",
@@ -323,6 +342,28 @@ async def mqtt_loop(data: Data):
         use_shared_topic=True,
     )
 
+    mqtt.add_sensor(
+        name="Game of Life Period",
+        unique_id="nowspinning_gol_period",
+        # needs units to display as graph in HA
+        unit_of_measurement="",
+        icon="mdi:sine-wave",
+        value_template="{{ value_json.gol_period.value }}",
+        availability_template="{{ value_json.gol_period.available }}",
+        use_shared_topic=True,
+    )
+
+    mqtt.add_sensor(
+        name="Game of Life Period Generation",
+        unique_id="nowspinning_gol_period_generation",
+        # needs units to display as graph in HA
+        unit_of_measurement="",
+        icon="mdi:counter",
+        value_template="{{ value_json.gol_period_generation.value }}",
+        availability_template="{{ value_json.gol_period_generation.available }}",
+        use_shared_topic=True,
+    )
+
     mqtt.add_number(
         name="Game of Life Seconds Per Tick",
         callback=callbacks.game_of_life_spt,
@@ -334,7 +375,7 @@ async def mqtt_loop(data: Data):
         mode="slider",
         min=0.0,
         max=10.0,
-        step=0.1,
+        step=0.005,
     )
 
     mqtt.add_subscriber_only(
@@ -374,6 +415,74 @@ async def mqtt_loop(data: Data):
         start_topic="flappy-bird/start",
     )
 
+    mqtt.add_sensor(
+        name="Render FPS",
+        unique_id="nowspinning_render_fps",
+        entity_category="diagnostic",
+        unit_of_measurement="fps",
+        icon="mdi:speedometer",
+        value_template="{{ value_json.render_fps.value }}",
+        availability_template="{{ value_json.render_fps.available }}",
+        use_shared_topic=True,
+    )
+
+    mqtt.add_sensor(
+        name="Render Draw Time",
+        unique_id="nowspinning_render_draw_p50",
+        entity_category="diagnostic",
+        unit_of_measurement="ms",
+        icon="mdi:timer-outline",
+        value_template="{{ value_json.render_draw_p50.value }}",
+        availability_template="{{ value_json.render_draw_p50.available }}",
+        use_shared_topic=True,
+    )
+
+    mqtt.add_sensor(
+        name="Render Draw Time p99",
+        unique_id="nowspinning_render_draw_p99",
+        entity_category="diagnostic",
+        unit_of_measurement="ms",
+        icon="mdi:timer-alert-outline",
+        value_template="{{ value_json.render_draw_p99.value }}",
+        availability_template="{{ value_json.render_draw_p99.available }}",
+        use_shared_topic=True,
+    )
+
+    mqtt.add_sensor(
+        name="Render Swap Time",
+        unique_id="nowspinning_render_swap_p50",
+        entity_category="diagnostic",
+        unit_of_measurement="ms",
+        icon="mdi:swap-horizontal",
+        value_template="{{ value_json.render_swap_p50.value }}",
+        availability_template="{{ value_json.render_swap_p50.available }}",
+        use_shared_topic=True,
+    )
+
+    mqtt.add_sensor(
+        name="Render Dropped Frames",
+        unique_id="nowspinning_render_dropped",
+        entity_category="diagnostic",
+        # needs units to display as graph in HA
+        unit_of_measurement="",
+        icon="mdi:filmstrip-off",
+        value_template="{{ value_json.render_dropped.value }}",
+        availability_template="{{ value_json.render_dropped.available }}",
+        use_shared_topic=True,
+    )
+
+    mqtt.add_sensor(
+        name="Render Slow Frames",
+        unique_id="nowspinning_render_slow",
+        entity_category="diagnostic",
+        # needs units to display as graph in HA
+        unit_of_measurement="",
+        icon="mdi:timer-sand",
+        value_template="{{ value_json.render_slow.value }}",
+        availability_template="{{ value_json.render_slow.available }}",
+        use_shared_topic=True,
+    )
+
     await mqtt.connect_client()
 
     while data.is_running:
@@ -436,7 +545,18 @@ async def loops(data: Data):
 
     properties.on_properties_changed(on_prop_change)
 
-    await asyncio.gather(matrix_loop(matrix, data), air_loop(data), mqtt_loop(data))
+    record_path = os.environ.get("RECORDING_PATH")
+    if record_path:
+        data.recorder = Recorder(record_path, matrix.width, matrix.height)
+
+    render = RenderThread(matrix, data)
+    render.start()
+
+    await asyncio.gather(air_loop(data), mqtt_loop(data))
+    await asyncio.to_thread(render.join)
+
+    if data.recorder is not None:
+        data.recorder.close()
 
     bus.disconnect()
 
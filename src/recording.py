@@ -0,0 +1,198 @@
+import gzip
+import logging
+import pickle
+from queue import Queue
+from threading import RLock
+from typing import Any, Iterator
+
+import numpy as np
+
+# records written while a frame is drawn get the frame's time
+from frameclock import perf_counter
+
+logger = logging.getLogger(__name__)
+
+RECORDING_VERSION = 2
+
+# Data queues views take commands from while drawing
+COMMAND_QUEUES = ("game_of_life_commands", "flappy_bird_commands")
+# Data attributes that aren't state a view draws from
+UNRECORDED = {
+    "is_running",
+    "eq_stream",
+    "render_stats",
+    "recorder",
+    *COMMAND_QUEUES,
+}
+# the music view draws straight from the eq stream's buffer
+EQ_FRAME_BUFFER = "eq_stream.frame_buffer"
+
+HEADER = "header"
+MESSAGE = "message"
+COMMAND = "command"
+STATE = "state"
+FRAME = "frame"
+
+
+class Recorder(object):
+    """Writes every committed frame and what changed to cause it to a file.
+
+    The file is a gzip stream of pickled records. A frame record holds the
+    Data values that changed since the previous frame and the pixels XORed
+    with the previous frame, which is mostly zeros and compresses well.
+    MQTT messages and queued commands are written as they arrive, and a
+    view's state is written before its first frame after it loads, so a
+    replay doesn't have to start it from scratch. What a view took from
+    another thread to draw a frame, like a Game of Life generation from its
+    worker, is written with the frame. A frame record also counts the
+    commands taken from each queue so far, a command queued while a view
+    was drawing is only handed to it for the next frame on replay too.
+    """
+
+    def __init__(self, path: str, width: int, height: int) -> None:
+        self.path = path
+        self.frames = 0
+        self._file = gzip.open(path, "wb", compresslevel=6)
+        self._lock = RLock()
+        self._last_values: dict[str, Any] = {}
+        self._last_pixels = np.zeros((height, width, 3), dtype=np.uint8)
+        self._delta = np.zeros_like(self._last_pixels)
+        # the view the last state was written for, and the last input
+        self.view: str = None
+        self._input: Any = None
+        # commands written for each queue
+        self._commands = dict.fromkeys(COMMAND_QUEUES, 0)
+
+        logger.info(f"Recording frames to {path}")
+        self._write(
+            {
+                "type": HEADER,
+                "version": RECORDING_VERSION,
+                "width": width,
+                "height": height,
+                "time": perf_counter(),
+            }
+        )
+
+    def _write(self, record: dict) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            pickle.dump(record, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def message(self, topic: str, payload: str) -> None:
+        self._write(
+            {
+                "type": MESSAGE,
+                "time": perf_counter(),
+                "topic": topic,
+                "payload": payload,
+            }
+        )
+
+    def command(self, name: str, command: str, queue: Queue) -> None:
+        """Queue a command and write it, together so a frame never counts
+        one without the other"""
+        with self._lock:
+            queue.put_nowait(command)
+            self._commands[name] += 1
+            self._write(
+                {
+                    "type": COMMAND,
+                    "time": perf_counter(),
+                    "queue": name,
+                    "command": command,
+                }
+            )
+
+    def _taken(self, data) -> dict[str, int]:
+        """Commands taken off each queue since recording started"""
+        with self._lock:
+            return {
+                name: count - getattr(data, name).qsize()
+                for name, count in self._commands.items()
+            }
+
+    def view_state(self, view: str, state: Any) -> None:
+        self.view = view
+        self._write(
+            {
+                "type": STATE,
+                "time": perf_counter(),
+                "view": view,
+                "state": state,
+            }
+        )
+
+    def _changes(self, data) -> dict[str, Any]:
+        """Data values that were replaced since the last frame"""
+        values = {
+            name: value
+            for name, value in data.__dict__.items()
+            if name not in UNRECORDED
+        }
+        values[EQ_FRAME_BUFFER] = data.eq_stream.frame_buffer
+
+        # callbacks replace values rather than mutating them, so identity is
+        # enough to spot a change without comparing big payloads
+        changes = {
+            name: value
+            for name, value in values.items()
+            if name not in self._last_values or self._last_values[name] is not value
+        }
+        self._last_values = values
+        return changes
+
+    def frame(
+        self,
+        data,
+        view: str,
+        pixels: np.ndarray,
+        time: float,
+        draw_time: float,
+        input: Any = None,
+    ) -> None:
+        """Record a frame that is now on the panel, time is the time the view
+        saw while it drew it and input its get_input()"""
+        np.bitwise_xor(pixels, self._last_pixels, out=self._delta)
+        self._last_pixels[:] = pixels
+        self.frames += 1
+        record = {
+            "type": FRAME,
+            "time": time,
+            "wall": perf_counter.wall_time(),
+            "view": view,
+            "draw_time": draw_time,
+            "changes": self._changes(data),
+            "taken": self._taken(data),
+            "delta": self._delta,
+        }
+        if input is not self._input:
+            # inputs are never changed once they're handed over, like Data
+            # values, so only a new one is written
+            record["input"] = input
+            self._input = input
+        self._write(record)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+        logger.info(f"Recorded {self.frames} frames to {self.path}")
+
+
+def read_recording(path: str) -> Iterator[dict]:
+    """Yield the records of a recording in the order they were written"""
+    with gzip.open(path, "rb") as f:
+        header = pickle.load(f)
+        if header.get("type") != HEADER or header.get("version") != RECORDING_VERSION:
+            raise ValueError(f"{path} is not a version {RECORDING_VERSION} recording")
+        yield header
+
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
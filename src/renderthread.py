@@ -0,0 +1,167 @@
+import asyncio
+import logging
+from threading import Thread
+from time import perf_counter
+
+from rgbmatrix import RGBMatrix
+
+from constants import DEFAULT_VIEW, IDLE_POLL_SECS
+from data import Data
+from drawwatchdog import DrawWatchdog
+from framebuffer import FrameBuffer
+import frameclock
+from view import View, VIEWS
+
+logger = logging.getLogger(__name__)
+
+
+class RenderThread(Thread):
+    """Owns the matrix and draws the views on its own event loop.
+
+    MQTT, the air sensors and D-Bus all run on the main event loop, so a slow
+    callback there used to hold up the panel. Each frame here is drawn from a
+    snapshot of Data instead of the live object.
+    """
+
+    def __init__(self, matrix: RGBMatrix, data: Data) -> None:
+        super().__init__(name="render", daemon=True)
+        self.matrix = matrix
+        self.data = data
+        # double buffered so the previous frame's snapshot is left alone
+        # while the next one is taken, and neither is allocated per frame
+        self._snapshots = (Data.__new__(Data), Data.__new__(Data))
+        self._snapshot_index = 0
+        self.watchdog = DrawWatchdog()
+
+    def next_snapshot(self) -> Data:
+        self._snapshot_index ^= 1
+        return self.data.snapshot(into=self._snapshots[self._snapshot_index])
+
+    def changed_keys(self, data: Data) -> list[str]:
+        """Data values replaced since the previous snapshot was taken"""
+        previous = self._snapshots[self._snapshot_index ^ 1].__dict__
+        if not previous:
+            return []
+        return sorted(
+            name
+            for name, value in data.__dict__.items()
+            if previous.get(name) is not value and name not in Data.render_outputs
+        )
+
+    def run(self) -> None:
+        self.watchdog.start()
+        try:
+            asyncio.run(self.matrix_loop())
+        except Exception:
+            logger.critical("Render thread stopped", exc_info=True)
+        finally:
+            self.watchdog.stop()
+
+    async def wait_for_frame(self, deadline: float, view_name: str):
+        """Sleep until the next frame is due, waking early if the view changes"""
+        data = self.data
+        remaining = deadline - perf_counter()
+        if remaining <= 0:
+            await asyncio.sleep(0)
+            return
+
+        while remaining > 0 and data.is_running and data.view == view_name:
+            await asyncio.sleep(min(remaining, IDLE_POLL_SECS))
+            remaining = deadline - perf_counter()
+
+    async def matrix_loop(self):
+        logger.info("Init matrix loop")
+        matrix = self.matrix
+        canvas = matrix.CreateFrameCanvas()
+        # views draw into one frame that is uploaded to the canvas in a single call
+        frame = FrameBuffer(matrix.width, matrix.height)
+
+        view_names = [v for v in VIEWS.keys()]
+        logger.info(f"Init views: {','.join(view_names)}")
+        max_unexpected_errors = 5
+        unexpected_errors = 0
+        current_view: View = None
+        # the view and content key of the frame currently on the panel
+        committed_view: View = None
+        committed_key = None
+        while self.data.is_running:
+            frame_start = perf_counter()
+            # the view sees frame_start as the time for all of this frame
+            frameclock.perf_counter.hold(frame_start)
+
+            if self.data.view not in VIEWS:
+                self.data.view = DEFAULT_VIEW
+
+            data = self.next_snapshot()
+            data_view = VIEWS[data.view]
+            if current_view is not data_view:
+                if current_view is not None:
+                    current_view.unload()
+                data_view.load()
+
+            current_view = data_view
+            view_name = data.view
+            recorder = data.recorder
+            if recorder is not None and recorder.view != view_name:
+                # replays start the view from here instead of from scratch
+                recorder.view_state(view_name, current_view.get_state())
+
+            frame_interval = current_view.frame_interval(data)
+            next_frame = frame_start + frame_interval
+
+            content_key = current_view.content_key(data)
+            is_stale = content_key is not None and committed_view is current_view
+            if is_stale and content_key == committed_key:
+                # the panel already shows this frame, leave it there
+                data.render_stats.skip(view_name, frame_interval)
+                await self.wait_for_frame(next_frame, view_name)
+                continue
+
+            frame.Clear()
+            changed = self.changed_keys(data)
+            self.watchdog.begin()
+            draw_start = perf_counter()
+            try:
+                await current_view.draw(frame, data)
+                unexpected_errors = 0  # reset if we got here
+            except Exception as e:
+                content_key = None
+                if unexpected_errors >= max_unexpected_errors:
+                    self.watchdog.end()
+                    await self.wait_for_frame(next_frame, view_name)
+                    continue
+
+                logger.critical(
+                    f"Unexpected error drawing {data.view} view", exc_info=True
+                )
+
+                unexpected_errors += 1
+                if unexpected_errors >= max_unexpected_errors:
+                    logger.critical(
+                        f"Max errors ({max_unexpected_errors}) reached. The previous error will not be logged again until resolved or restarted."
+                    )
+
+            draw_time = perf_counter() - draw_start
+            samples = self.watchdog.end()
+            if draw_time > self.watchdog.budget:
+                self.watchdog.report(view_name, draw_time, samples, changed)
+            self.data.commit_render(data)
+
+            swap_start = perf_counter()
+            frame.upload(canvas)
+            canvas = matrix.SwapOnVSync(canvas)
+            swap_time = perf_counter() - swap_start
+            committed_view = current_view
+            committed_key = content_key
+
+            data.render_stats.record(view_name, draw_time, swap_time, frame_interval)
+            if recorder is not None:
+                recorder.frame(
+                    data,
+                    view_name,
+                    frame.pixels,
+                    frame_start,
+                    draw_time,
+                    current_view.get_input(),
+                )
+            await self.wait_for_frame(next_frame, view_name)
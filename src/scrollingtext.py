@@ -1,13 +1,22 @@
-from time import perf_counter
-
-from rgbmatrix.graphics import DrawText
-
-from constants import ALIGN_CENTER, ALIGN_LEFT, ALIGN_RIGHT, DIR_LEFT
+from constants import ALIGN_CENTER, ALIGN_LEFT, ALIGN_RIGHT, DIR_LEFT, TARGET_FPS
 from constants.colors import ColorRGB
 from constants.fonts import MonoFont
+from frameclock import perf_counter
+from glyphatlas import RenderedText
 
 
 class ScrollingText(object):
+    # what changes as it scrolls, everything else is fixed when it's made
+    STATE = (
+        "_text",
+        "_text_width",
+        "_pause_time",
+        "_pause_dur",
+        "_origin_x",
+        "_scroll_start",
+        "x",
+    )
+
     def __init__(
         self,
         font: MonoFont,
@@ -26,16 +35,24 @@ class ScrollingText(object):
     ) -> None:
         self._font = font
         self._color = color
+        self._rgb = (color.red, color.green, color.blue)
         self._scroll_dir = scroll_dir
         self._scroll_amount = scroll_amount
-        self._speed = speed
-        self._last_scrolled = perf_counter()
+        # seconds per step, 0 scrolls as fast as frames are drawn
+        self._speed = speed if speed > 0 else 1.0 / TARGET_FPS
         self._left_bound = left_bound
         self._right_bound = right_bound
         self._num_spaces = num_spaces
+        self._space_width = font.CharacterWidth(ord(" ")) * num_spaces
         self._pause_dur = pause_dur
         self._pause_time: float = None
         self._text = None
+        self._text_width = 0
+        # the text, and while scrolling the wrapped copy after it, as one mask
+        self._strip: RenderedText = None
+        # where the scroll started from and when, x is worked out from these
+        self._origin_x = starting_x
+        self._scroll_start = perf_counter()
 
         self.align = align
         self.starting_x = starting_x
@@ -50,11 +67,12 @@ class ScrollingText(object):
     @text.setter
     def text(self, value: str) -> None:
         if self._text != value:
+            self._text = value
+            self._text_width = self._font.str_width(value)
+            self._strip = None
             self.x = self.starting_x
             self.pause()
 
-        self._text = value
-
         if self.fits_in_bounds:
             if self.align is ALIGN_LEFT:
                 self.x = self._left_bound
@@ -63,13 +81,9 @@ class ScrollingText(object):
             elif self.align is ALIGN_CENTER:
                 self.x = (self.bound_width / 2) - (self.text_width / 2)
 
-    @property
-    def _space_width(self) -> int:
-        return self._font.CharacterWidth(ord(" ")) * self._num_spaces
-
     @property
     def text_width(self) -> int:
-        return self._font.str_width(self.text)
+        return self._text_width
 
     @property
     def is_paused(self) -> bool:
@@ -98,29 +112,56 @@ class ScrollingText(object):
         self._pause_time = perf_counter()
         if pause_dur is not None:
             self._pause_dur = pause_dur
+        self._origin_x = self.x
+        self._scroll_start = self._pause_time + self._pause_dur
 
     def unpause(self) -> None:
         self._pause_time = None
 
+    def get_state(self) -> dict:
+        return {name: getattr(self, name) for name in self.STATE}
+
+    def set_state(self, state: dict) -> None:
+        if state["_text"] != self._text:
+            self._strip = None
+        self.__dict__.update(state)
+
+    def _get_strip(self) -> RenderedText:
+        if self._strip is None:
+            text = self.text
+            if not self.fits_in_bounds:
+                text = f"{text}{' ' * self._num_spaces}{text}"
+            # long alerts would only push labels out of the shared cache
+            self._strip = self._font.atlas.render(text, cache=False)
+        return self._strip
+
+    def scroll(self, now: float) -> None:
+        """Move to where the text should be now, steps missed are caught up"""
+        if self.fits_in_bounds or now < self._scroll_start:
+            return
+
+        steps = int((now - self._scroll_start) / self._speed)
+        self.x = self._origin_x + self._scroll_dir * self._scroll_amount * steps
+
+        if self.is_out_of_bounds:
+            self.x = self._left_bound
+            self._pause_time = now
+            self._origin_x = self.x
+            self._scroll_start = now + self._pause_dur
+
     def draw(self, canvas, text: str = None) -> None:
         self.text = text
 
         if self.text is None or self.text.isspace():
             return
 
-        DrawText(canvas, self._font, self.x, self.y, self._color, self.text)
-
-        if self.fits_in_bounds:
-            return
-
-        x_2 = self.x - self._scroll_dir * (self.text_width + self._space_width)
-
-        DrawText(canvas, self._font, x_2, self.y, self._color, self.text)
+        self.scroll(perf_counter())
 
-        if not self.is_paused and perf_counter() - self._last_scrolled >= self._speed:
-            self.x += self._scroll_dir * self._scroll_amount
-            self._last_scrolled = perf_counter()
+        x = self.x
+        if self._scroll_dir > 0 and not self.fits_in_bounds:
+            # the wrapped copy trails on the left when scrolling right
+            x -= self.text_width + self._space_width
 
-        if self.is_out_of_bounds:
-            self.x = self._left_bound
-            self.pause()
+        strip = self._get_strip()
+        top = self.y - self._font.atlas.baseline
+        canvas.SetBitmap(strip.bitmap, int(x) + strip.left, top, self._rgb)
@@ -1,6 +1,6 @@
 from collections import deque, Counter
-from time import perf_counter
 
+import numpy as np
 from PIL import Image, ImageColor, ImageDraw
 
 from constants import (
@@ -18,15 +18,19 @@ from constants.colors import BLACK, ColorRGB, GRAY, WHITE
 from constants.fonts import FONT_4X6, FONT_5X8
 from data import Data
 from view.viewbase import View, register
-from rgbmatrix.graphics import DrawText
+from framebuffer import DrawText
+from frameclock import perf_counter
 from scrollingtext import ScrollingText
 from utils.images import get_contrast, get_min_contrast_fg_bg, CONSTRAST_MIN
 
+GAME_HEIGHT = 17  # two 9px team rows sharing a border
+
 
 @register
 class AllGames(View):
     name = ALLGAMES
     sort = 3
+    max_fps = 50.0  # filter scroll moves a pixel every 0.02s
 
     def __init__(self) -> None:
         super().__init__()
@@ -35,7 +39,16 @@ class AllGames(View):
         self.last_rotate = perf_counter()
         self.league = LEAGUEDEFAULT
 
-        self.background = Image.open("../img/sports-bg.jpg")
+        self.background = np.asarray(Image.open("../img/sports-bg.jpg").convert("RGB"))
+        self.cached_colors: dict[tuple[str, ...], tuple] = {}
+
+        # triangle in the top right corner of each game showing the league
+        corner = Image.new("L", (PANEL_WIDTH, GAME_HEIGHT))
+        right = PANEL_WIDTH
+        ImageDraw.Draw(corner).polygon(
+            xy=[(right, 0), (right, 6), (right - 6, 0)], fill=1, outline=1
+        )
+        self.league_corner = np.asarray(corner).astype(bool)
 
         self.filter_scroll = ScrollingText(
             font=FONT_5X8,
@@ -49,7 +62,35 @@ class AllGames(View):
             num_spaces=3,
         )
 
+    def is_idle(self, data: Data) -> bool:
+        # games only rotate every ROTATETIME so the scroll is all that moves
+        return self.filter_scroll.fits_in_bounds
+
+    def content_key(self, data: Data):
+        if not self.is_idle(data):
+            return None
+        rotate_due = perf_counter() - self.last_rotate >= ROTATETIME
+        return (data.all_games, self.offset, rotate_due)
+
+    def get_state(self):
+        return (
+            self.offset,
+            self.last_rotate,
+            self.league,
+            self.filter_scroll.get_state(),
+        )
+
+    def set_state(self, state) -> None:
+        self.offset, self.last_rotate, self.league, scroll = state
+        self.filter_scroll.set_state(scroll)
+
     def get_colors(self, team_colors: list[str]):
+        key = tuple(team_colors)
+        if key not in self.cached_colors:
+            self.cached_colors[key] = self.get_contrast_colors(team_colors)
+        return self.cached_colors[key]
+
+    def get_contrast_colors(self, team_colors: list[str]):
         background = ImageColor.getcolor(team_colors[0], "RGB")
         outline = background
         txt = ImageColor.getcolor(team_colors[1], "RGB")
@@ -61,28 +102,19 @@ class AllGames(View):
     def draw_team(self, canvas, x, y, abbr, score, colors):
         bg, txt, outline = self.get_colors(colors)
         row_height = FONT_4X6.height + 3
-        top = 0
-        left = 0
-        bottom = row_height
-        right = int(PANEL_WIDTH / 2)
-        middle = int(right / 2)
-
-        img = Image.new("RGB", (right, row_height), BLACK.rgb)
-        img_draw = ImageDraw.Draw(img)
-
-        img_draw.rectangle(
-            xy=[(left, top), (right - 1, bottom - 1)],
-            fill=None,
-            outline=outline,
+        top = y
+        left = x
+        bottom = y + row_height
+        right = x + int(PANEL_WIDTH / 2)
+        middle = int(PANEL_WIDTH / 4)
+
+        canvas.rectangle(
+            left, top, right - 1, bottom - 1, outline=outline, fill=BLACK.rgb
         )
-        img_draw.rectangle(
-            xy=[(left, top), (middle - 1, bottom - 1)],
-            fill=bg,
-            outline=outline,
+        canvas.rectangle(
+            left, top, left + middle - 1, bottom - 1, outline=outline, fill=bg
         )
 
-        canvas.SetImage(img, x, y)
-
         y = y + FONT_4X6.height + 1
         DrawText(
             canvas,
@@ -103,33 +135,18 @@ class AllGames(View):
 
     def draw_game(self, canvas, x, y, game):
         row_height = 9
-        top = 0
-        left = 0
-        bottom = row_height * 2 - 1
-        right = PANEL_WIDTH
+        bottom = GAME_HEIGHT
+        right = x + PANEL_WIDTH
 
         team_width = int(PANEL_WIDTH / 2)
 
-        background = Image.new("RGB", (PANEL_WIDTH, bottom), BLACK.rgb)
-        background_draw = ImageDraw.Draw(background)
-
         league_color = WHITE
         if game.get("league") in LEAGUE_COLORS:
             league_color = LEAGUE_COLORS[game.get("league")]
 
-        background_draw.polygon(
-            xy=[(right, top), (right, top + 6), (right - 6, top)],
-            fill=league_color.rgb,
-            outline=league_color.rgb,
-        )
-
-        background_draw.rectangle(
-            xy=[(left, top), (right - 1, bottom - 1)],
-            fill=None,
-            outline=GRAY.rgb,
-        )
-
-        canvas.SetImage(background, x, y)
+        canvas.fill_rect(x, y, right - 1, y + bottom - 1, BLACK.rgb)
+        canvas.SetBitmap(self.league_corner, x, y, league_color.rgb)
+        canvas.rectangle(x, y, right - 1, y + bottom - 1, outline=GRAY.rgb)
 
         clock = (
             game.get("clock")
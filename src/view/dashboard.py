@@ -1,6 +1,4 @@
-from datetime import datetime
-
-from constants import PANEL_HEIGHT, PANEL_WIDTH
+from constants import IDLE_FPS, PANEL_HEIGHT, PANEL_WIDTH
 from constants.colors import (
     WHITE,
     CRIMSON,
@@ -14,53 +12,31 @@ from constants.colors import (
 )
 from constants.fonts import FONT_4X6, FONT_8X13
 from data import Data
-from rgbmatrix.graphics import DrawText
+from framebuffer import DrawText
+from frameclock import now
 
 from linegraph import LineGraph
 from view.viewbase import View, register
 
+# a day of hourly averages and the live value, leaving room for the label
+GRAPH_WIDTH = 73
+NO_AVERAGES: list[float] = []
+
 
 @register
 class Dashboard(View):
     sort = 2
+    # nothing animates, the clock only changes once a minute
+    max_fps = IDLE_FPS
 
     def __init__(self) -> None:
         super().__init__()
 
-    async def draw(self, canvas, data: Data):
-        now = datetime.now()
-        now_str = now.strftime("%I:%M %m/%d/%Y")
-
-        x = PANEL_WIDTH - FONT_8X13.str_width(now_str) / 2
-        y = FONT_8X13.height - 2
-        DrawText(canvas, FONT_8X13, x, y, WHITE, now_str)
-
-        tmpr_avgs = []
-        hum_avgs = []
-        voc_avgs = []
-        co2_avgs = []
-
-        tmpr_avgs.extend(data.averages.get("temperature") or [])
-        if data.temperature_f is not None:
-            tmpr_avgs.append(round(data.temperature_f, 1))
-
-        hum_avgs.extend(data.averages.get("humidity") or [])
-        if data.humidity is not None:
-            hum_avgs.append(round(data.humidity, 1))
-
-        voc_avgs.extend(data.averages.get("voc") or [])
-        if data.voc is not None:
-            voc_avgs.append(round(data.voc))
-
-        co2_avgs.extend(data.averages.get("co2") or [])
-        if data.co2 is not None:
-            co2_avgs.append(round(data.co2))
-
-        graphs = [
+        # kept between frames so each one can reuse its last graph image
+        self.graphs = [
             LineGraph(
                 label="Temp",
                 units="°F",
-                data=tmpr_avgs,
                 round=1,
                 line_color=CRIMSON.rgb,
                 fill_color=DARKRED.rgb,
@@ -68,31 +44,60 @@ class Dashboard(View):
             LineGraph(
                 label="Hum",
                 units="%",
-                data=hum_avgs,
                 round=1,
                 line_color=COBALT.rgb,
                 fill_color=NAVY.rgb,
             ),
             LineGraph(
                 label="VOC",
-                data=voc_avgs,
                 line_color=SOFTGREEN.rgb,
                 fill_color=DARKGREEN.rgb,
             ),
             LineGraph(
                 label="CO2",
                 units="ppm",
-                data=co2_avgs,
                 line_color=LIGHTGRAY.rgb,
                 fill_color=DARKSLATEGRAY.rgb,
             ),
         ]
-
-        graph_x = 0
+        # each graph's background is the fill of the one above it
         background = (0, 0, 0)
-        graph: LineGraph
-        for i, graph in enumerate(graphs):
+        for graph in self.graphs:
+            graph.max_width = GRAPH_WIDTH
             graph.background = background
-            graph_y = PANEL_HEIGHT - graph.height * (len(graphs) - i)
-            graph.draw(canvas, FONT_4X6, graph_x, graph_y, WHITE)
             background = graph.fill_color
+
+    def clock_str(self) -> str:
+        return now().strftime("%I:%M %m/%d/%Y")
+
+    def content_key(self, data: Data):
+        return (
+            self.clock_str(),
+            data.averages,
+            data.temperature_f,
+            data.humidity,
+            data.voc,
+            data.co2,
+        )
+
+    async def draw(self, canvas, data: Data):
+        now_str = self.clock_str()
+
+        x = PANEL_WIDTH - FONT_8X13.str_width(now_str) / 2
+        y = FONT_8X13.height - 2
+        DrawText(canvas, FONT_8X13, x, y, WHITE, now_str)
+
+        graph_data = [
+            ("temperature", data.temperature_f, 1),
+            ("humidity", data.humidity, 1),
+            ("voc", data.voc, None),
+            ("co2", data.co2, None),
+        ]
+        graph: LineGraph
+        for i, (graph, (key, live, digits)) in enumerate(zip(self.graphs, graph_data)):
+            # the same list every frame until new averages come in
+            graph.data = data.averages.get(key) or NO_AVERAGES
+            graph.live = None if live is None else round(live, digits)
+
+            graph_y = PANEL_HEIGHT - graph.height * (len(self.graphs) - i)
+            graph.draw(canvas, FONT_4X6, 0, graph_y, WHITE)
@@ -1,15 +1,15 @@
-import asyncio
 import math
 import logging
-from time import perf_counter
+from queue import Queue
 from typing import Dict, List, TypeAlias
 
 import numpy as np
-from PIL import Image, ImageDraw
-from rgbmatrix.graphics import DrawText
+from PIL import Image
 
+from compositor import Compositor, SpriteImage
 from constants import FLAPPYBIRD, PANEL_HEIGHT, PANEL_WIDTH
 from data import Data
+from frameclock import perf_counter
 from view.viewbase import View, register
 
 logger = logging.getLogger(__name__)
@@ -112,10 +112,13 @@ class Sprite(object):
         img = Sprite.sprite_sheet.crop(coords)
         return img
 
-    def __init__(self, container: Image.Image, x: float = 0, y: float = 0) -> None:
+    def __init__(self, container: Compositor, x: float = 0, y: float = 0) -> None:
         self.sprite_sheet: Image.Image = None
-        self.container: Image.Image = container
+        self.container: Compositor = container
         self._img: Image.Image = None
+        # img ready to blend, and the img it was made from
+        self._pixels: SpriteImage = None
+        self._pixels_img: Image.Image = None
         self.x: float = x
         self.y: float = y
         self.x_velocity: float = 0.0
@@ -129,6 +132,15 @@ class Sprite(object):
     def img(self, value):
         self._img = value
 
+    @property
+    def pixels(self) -> SpriteImage:
+        """img as a SpriteImage, only made again when img is a new image"""
+        img = self.img
+        if img is not self._pixels_img:
+            self._pixels = SpriteImage.from_image(img)
+            self._pixels_img = img
+        return self._pixels
+
     def update(self, frame_diff: float, game_state: str = None):
         pass
 
@@ -136,22 +148,19 @@ class Sprite(object):
         if self.img is None:
             return
 
-        self.container.paste(
-            self.img, (int(round(self.x)), int(round(self.y))), self.img
-        )
-
-    def clear(self):
-        mask = Image.new("L", (self.img.width, self.img.height), 0)
-        self.img.putalpha(mask)
+        self.container.draw(self.pixels, self.x, self.y)
 
 
 class Bird(Sprite):
-    def __init__(self, container: Image.Image, x: float = 0, y: float = 0) -> None:
+    def __init__(self, container: Compositor, x: float = 0, y: float = 0) -> None:
         self.radius = 4
         self.sprite_frame = 0
         self.sprites: List[Image.Image] = [
             Sprite.get_sprite(coords) for coords in BIRD_FRAMES
         ]
+        self.frames: List[SpriteImage] = [
+            SpriteImage.from_image(img) for img in self.sprites
+        ]
         self.frame_time = perf_counter()
         self.ground = float(PANEL_HEIGHT - GROUND_HEIGHT - self.img.height)
         super().__init__(container, x, y)
@@ -161,6 +170,10 @@ class Bird(Sprite):
         self._img = self.sprites[self.sprite_frame]
         return self._img
 
+    @property
+    def pixels(self) -> SpriteImage:
+        return self.frames[self.sprite_frame]
+
     @property
     def y(self):
         return self._y
@@ -202,11 +215,11 @@ class Tube(Sprite):
         cls.top = Sprite.get_sprite(SPRITES["TopTube"])
         cls.bottom = Sprite.get_sprite(SPRITES["BottomTube"])
 
-    def __init__(self, container: Image.Image, x: float) -> None:
+    def __init__(self, container: Compositor, x: float, level: int = None) -> None:
         if not Tube.top or not Tube.bottom:
             Tube.__init_tubes()
 
-        self.level = self.random_level()
+        self.level = self.random_level() if level is None else level
         super().__init__(container, x, 0)
         self.x_velocity = -50.0
 
@@ -234,35 +247,65 @@ class Tube(Sprite):
 
 
 class TubeMaze(Sprite):
+    """The tubes, kept in a strip with a slot per tube that is repeated
+    twice over, so the maze from its front tube is always one window into
+    the strip. A tube is only written to the strip when it spawns.
+
+    The ground is in front of the tubes, so the strip stops where it starts.
+    """
+
     def __init__(self, container, x=0, y=0):
         super().__init__(container, x, y)
         self.tubes: List[Tube] = []
-        self.img = Image.new("RGBA", (NUM_TUBES * TUBE_SPACING, PANEL_HEIGHT), BLANK)
+        width = NUM_TUBES * TUBE_SPACING
+        self.strip = SpriteImage.blank(width * 2, PANEL_HEIGHT - GROUND_HEIGHT)
+        # slot of the front tube
+        self.front = 0
         self.new_tubes()
 
+    def write_tube(self, slot: int, tube: Tube) -> None:
+        for x in (slot * TUBE_SPACING, (slot + NUM_TUBES) * TUBE_SPACING):
+            self.strip.paste(tube.pixels, x, 0)
+
+    @property
+    def pixels(self) -> SpriteImage:
+        """The tubes in order from the front one, only remade when one spawns"""
+        if self._pixels is None:
+            width = NUM_TUBES * TUBE_SPACING
+            self._pixels = self.strip.window(self.front * TUBE_SPACING, width)
+        return self._pixels
+
     def new_tubes(self):
-        self.clear()
         self.x = PANEL_WIDTH
-        self.tubes = [Tube(self.img, i * TUBE_SPACING) for i in range(NUM_TUBES)]
+        self.set_tubes([Tube(self.container, 0) for _ in range(NUM_TUBES)])
+
+    def set_tubes(self, tubes: List[Tube]) -> None:
+        """Start the maze over with these tubes, front one first"""
+        self.tubes = tubes
+        self.front = 0
+        for slot, tube in enumerate(tubes):
+            tube.x = slot * TUBE_SPACING
+            self.write_tube(slot, tube)
+        self._pixels = None
 
     def update(self, frame_diff, game_state=None):
         self.x -= X_SPEED * frame_diff
 
         if self.x < -1 * TUBE_SPACING:
-            self.clear()
             del self.tubes[0]
             self.x += TUBE_SPACING
-            new_tube = Tube(self.img, PANEL_WIDTH * 2)
+            new_tube = Tube(self.container, PANEL_WIDTH * 2)
             self.tubes.append(new_tube)
+            # the front tube's slot is at the back now
+            self.write_tube(self.front, new_tube)
+            self.front = (self.front + 1) % NUM_TUBES
+            self._pixels = None
 
         for i, tube in enumerate(self.tubes):
             tube.x = i * TUBE_SPACING
 
     def draw(self):
-        for tube in self.tubes:
-            tube.draw()
-
-        super().draw()
+        self.container.draw(self.pixels, self.x, self.y)
 
 
 class Digit(Sprite):
@@ -349,6 +392,14 @@ class Title(Sprite):
 
 
 class EndlessScroll(Sprite):
+    """A sprite tiled over the sky into a strip one screen longer than the
+    sprite, drawn into the backdrop as a window that slides along it and
+    wraps every sprite width. Only redrawn when the window moves.
+
+    Layers at different speeds must not overlap, each one's strip has the
+    sky baked in behind it.
+    """
+
     def __init__(
         self,
         container,
@@ -360,33 +411,57 @@ class EndlessScroll(Sprite):
         super().__init__(container, x, y)
         self.coords = coords
         self.speed_mult = speed_mult
+        self._strip: np.ndarray = None
+        self._offset: int = None
 
     @property
     def img(self) -> Image.Image:
         if self._img is None:
-            sprite = Sprite.get_sprite(self.coords)
-            img = Image.new("RGBA", (sprite.width * 2, sprite.height), BLANK)
-            img.paste(sprite, (0, 0), sprite)
-            img.paste(sprite, (sprite.width, 0), sprite)
-            self._img = img
+            self._img = Sprite.get_sprite(self.coords)
         return self._img
 
+    @property
+    def strip(self) -> np.ndarray:
+        if self._strip is None:
+            width = self.img.width + self.container.width
+            strip = Compositor(width, self.img.height, BACKGROUND)
+            for x in range(0, width, self.img.width):
+                strip.draw(self.pixels, x, 0)
+            self._strip = strip.compose()
+        return self._strip
+
+    def scroll_to(self, x: float) -> None:
+        """Move to x, copied into the backdrop on the next draw even if the
+        last one left it there"""
+        self.x = x
+        self._offset = None
+
     def update(self, frame_diff, game_state=None):
         self.x -= X_SPEED * self.speed_mult * frame_diff
-        if self.x <= -1 * self.img.width / 2:
+        if self.x <= -1 * self.img.width:
             self.x = 0
 
+    def draw(self):
+        offset = -int(round(self.x))
+        if offset == self._offset:
+            return
+
+        window = self.strip[:, offset : offset + self.container.width]
+        self.container.set_backdrop(window, 0, int(round(self.y)))
+        self._offset = offset
+
 
 @register
 class FlappyBird(View):
     name: str = FLAPPYBIRD
     sort = 7
+    max_fps = 1.0 / FRAME_TIME
+    idle_fps = 10.0  # fast enough that a flap to start feels instant
 
     def __init__(self) -> None:
         super().__init__()
         self.last_frame = perf_counter()
-        size = (PANEL_WIDTH * 2, PANEL_HEIGHT)
-        self.screen_buffer = Image.new("RGBA", size, BACKGROUND)
+        self.screen_buffer = Compositor(PANEL_WIDTH * 2, PANEL_HEIGHT, BACKGROUND)
         self._game_state = READY
 
         self.bird = Bird(self.screen_buffer, INIT_BIRD_X, INIT_BIRD_Y)
@@ -410,12 +485,56 @@ class FlappyBird(View):
 
         self.new_game()
 
+    @property
+    def layers(self) -> tuple[EndlessScroll, ...]:
+        return (self.ground, self.skyline, self.clouds)
+
+    def get_state(self):
+        bird = self.bird
+        return (
+            (self.game_state, self.game_state_time, self.last_frame),
+            (self.score.num, self.score.x),
+            (bird.y, bird.y_velocity, bird.sprite_frame, bird.frame_time),
+            (self.tube_maze.x, [tube.level for tube in self.tube_maze.tubes]),
+            [layer.x for layer in self.layers],
+            # on the panel until the next step, which can be frames away
+            self.screen_buffer.pixels,
+            # the levels of the tubes still to spawn
+            np.random.get_state(),
+        )
+
+    def set_state(self, state) -> None:
+        game, score, flight, maze, layers, pixels, random_state = state
+        self._game_state, self._game_state_time, self.last_frame = game
+        self.score.num, self.score.x = score
+        bird = self.bird
+        bird.y, bird.y_velocity, bird.sprite_frame, bird.frame_time = flight
+
+        self.tube_maze.x, levels = maze
+        self.tube_maze.set_tubes(
+            [Tube(self.screen_buffer, 0, level) for level in levels]
+        )
+        for layer, x in zip(self.layers, layers):
+            layer.scroll_to(x)
+
+        self.screen_buffer.pixels[...] = pixels
+        self.screen_buffer.invalidate()
+        np.random.set_state(random_state)
+
     def new_game(self):
         self.game_state = READY
         self.score.num = 0
         self.bird.y = INIT_BIRD_Y
         self.tube_maze.new_tubes()
 
+    def is_idle(self, data: Data) -> bool:
+        return self.game_state in [READY, PAUSED]
+
+    def content_key(self, data: Data):
+        if not self.is_idle(data) or not data.flappy_bird_commands.empty():
+            return None
+        return (self.game_state,)
+
     @property
     def game_state(self):
         return self._game_state
@@ -435,21 +554,19 @@ class FlappyBird(View):
     def time_since_game_state(self):
         return perf_counter() - self.game_state_time
 
-    async def handle_commands(self, commands: asyncio.Queue):
+    async def handle_commands(self, commands: Queue):
         while not commands.empty():
-            command = await commands.get()
+            command = commands.get_nowait()
             if command == "FLAP":
                 if self.game_state in [READY, PAUSED]:
                     self.game_state = PLAYING
+                    # idle frames may have been skipped, don't jump ahead
+                    self.last_frame = perf_counter()
                 elif self.game_state == GAME_OVER and self.time_since_game_state > 1.0:
                     self.new_game()
                 elif self.game_state == PLAYING:
                     self.bird.flap()
 
-    def clear_buffer(self):
-        draw = ImageDraw.Draw(self.screen_buffer)
-        draw.rectangle((0, 0, PANEL_WIDTH * 2, PANEL_HEIGHT), fill=BACKGROUND)
-
     def update_sprites(self, frame_diff):
         if self.game_state in [PLAYING, GAME_OVER]:
             self.bird.update(frame_diff, self.game_state)
@@ -535,11 +652,11 @@ class FlappyBird(View):
 
         if frame_diff >= FRAME_TIME:
             self.update_sprites(frame_diff)
-            self.clear_buffer()
             self.draw_sprites()
+            self.screen_buffer.compose()
             if self.game_state == PLAYING:
                 if self.collision_check():
                     self.game_state = GAME_OVER
             self.last_frame = perf_counter()
 
-        canvas.SetImage(self.screen_buffer.convert("RGB"), 0, 0)
+        canvas.SetImage(self.screen_buffer.pixels, 0, 0)
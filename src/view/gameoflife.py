@@ -1,115 +1,170 @@
-import asyncio
-from time import perf_counter
-
-import numpy as np
-from PIL import Image, ImageDraw
-from rgbmatrix.graphics import DrawText
-from scipy.signal import convolve2d
-
-from constants import (
-    GAMEOFLIFE,
-    GRID_MARGIN,
-    GRID_HEIGHT,
-    GRID_WIDTH,
-    RNG_RANGE,
-    INIT_CUTOFF,
-    ALIVE,
-    DEAD,
-    ALIVE_RGB,
-    DEAD_RGB,
-    ADD_NOISE,
-    RESET,
-)
+import logging
+from queue import Queue
+
+from constants import GAMEOFLIFE, PANEL_HEIGHT, PANEL_WIDTH
 from constants.fonts import FONT_4X6
-from constants.colors import BLACK, ROYALBLUE, WHITE
+from constants.colors import BLACK, ROYALBLUE
 from data import Data
+from framebuffer import DrawText
+from life import LifeFrame, Settings, Simulation, SimulationWorker
 from view.viewbase import View, register
 
+logger = logging.getLogger(__name__)
+
 
 @register
 class GameOfLife(View):
     name: str = GAMEOFLIFE
     sort = 6
+    # step on a worker thread while loaded, without one the simulation steps
+    # as part of drawing, as it does on replay
+    use_worker: bool = True
 
     def __init__(self) -> None:
         super().__init__()
-        self.generation: int = 0
-        self.grid_data = self.new_random_grid()
-        self.last_tick = perf_counter()
-
-    @property
-    def alive_cells(self) -> int:
-        return self.grid_data.sum()
+        self.simulation = Simulation(PANEL_WIDTH * 2, PANEL_HEIGHT)
+        self.worker: SimulationWorker = None
+        # stopped but maybe still finishing a long step, the next worker
+        # waits for it so only one steps the simulation at a time
+        self.stopped_worker: SimulationWorker = None
+        # the frame drawn last, and when replaying a recording made with the
+        # worker, the one it published to draw instead of stepping
+        self.drawn: LifeFrame = None
+        self.replayed: LifeFrame = None
+
+    def load(self):
+        super().load()
+        if self.use_worker:
+            # started on the first draw, once there are settings to give it
+            previous = self.stopped_worker
+            if previous is not None and not previous.is_alive():
+                previous = None
+            self.worker = SimulationWorker(self.simulation, None, previous)
+            self.stopped_worker = None
+
+    def unload(self):
+        super().unload()
+        if self.worker is not None:
+            # not joined, a fast forward can take seconds to finish
+            self.worker.stop()
+            if self.worker.ident is not None:
+                self.stopped_worker = self.worker
+            self.worker = None
+
+    def get_state(self):
+        if self.worker is not None:
+            # it may be mid step, the frames it publishes are recorded instead
+            return None
+        return self.simulation.get_state()
+
+    def set_state(self, state) -> None:
+        if state is not None:
+            self.simulation.set_state(state)
+
+    def get_input(self):
+        if self.worker is None and self.replayed is None:
+            return None
+        return self.drawn
+
+    def set_input(self, frame: LifeFrame) -> None:
+        self.replayed = frame
+
+    def check_worker(self) -> None:
+        """Step as part of drawing from now on if the worker died"""
+        worker = self.worker
+        if worker is not None and worker.ident is not None and not worker.is_alive():
+            logger.warning("Game of Life worker stopped, stepping while drawing")
+            self.worker = None
+
+    def get_settings(self, data: Data) -> Settings:
+        return Settings(
+            seconds_per_tick=data.game_of_life_seconds_per_tick,
+            engine=data.game_of_life_engine,
+            rule=data.game_of_life_rule,
+            on_cycle=data.game_of_life_on_cycle,
+            pattern=data.game_of_life_pattern,
+        )
 
-    def new_random_grid(self, cutoff=INIT_CUTOFF):
-        rng = np.random.default_rng()
+    def frame_interval(self, data: Data) -> float:
+        # only redraw for a new generation, but keep buttons responsive
+        interval = min(data.game_of_life_seconds_per_tick, 1.0 / self.idle_fps)
+        return max(interval, 1.0 / self.max_fps)
 
-        random = rng.integers(low=0, high=RNG_RANGE, size=GRID_HEIGHT * GRID_WIDTH)
+    def content_key(self, data: Data):
+        self.check_worker()
+        if not data.game_of_life_commands.empty():
+            return None
 
-        arr = np.array([1 if x > cutoff else 0 for x in random])
-        return np.reshape(arr, (GRID_HEIGHT, GRID_WIDTH))
+        settings = self.get_settings(data)
+        if self.worker is not None:
+            if settings != self.worker.settings:
+                return None
+            # frames are only equal to themselves
+            return (self.worker.latest, data.game_of_life_show_gens)
 
-    def get_display_grid(self):
-        data = self.grid_data.copy().flatten()
-        arr = np.array([ALIVE_RGB if cell == ALIVE else DEAD_RGB for cell in data])
-        grid = np.reshape(arr, (GRID_HEIGHT, GRID_WIDTH, 3))
-        return grid
+        if self.simulation.tick_due(settings.seconds_per_tick):
+            return None
+        return (self.generation, data.game_of_life_show_gens, settings)
 
-    def get_neighbor_count_grid(self):
-        kernel = np.array(
-            [
-                [1, 1, 1],
-                [1, 0, 1],
-                [1, 1, 1],
-            ]
-        )
+    @property
+    def generation(self) -> int:
+        return self.simulation.generation
 
-        return np.asmatrix(convolve2d(self.grid_data, kernel, "same"))
+    @property
+    def alive_cells(self) -> int:
+        return self.simulation.engine.population
 
-    async def handle_commands(self, commands: asyncio.Queue):
+    async def handle_commands(self, commands: Queue):
         while not commands.empty():
-            command = await commands.get()
-            if command == RESET:
-                self.grid_data = self.new_random_grid()
-                self.generation = 0
-            elif command == ADD_NOISE:
-                noise = self.new_random_grid(cutoff=95)
-                new_grid = (noise == ALIVE) | (self.grid_data == ALIVE)
-                new_grid = np.asarray(new_grid.astype(int))
-                self.grid_data = new_grid
-
-    def tick(self):
-        self.generation += 1
-        neighbors = self.get_neighbor_count_grid()
-        # new_grid = np.zeros_like(self.grid_data)
-        new_grid = (neighbors == 3) | ((self.grid_data == ALIVE) & (neighbors == 2))
-        new_grid = np.asarray(new_grid.astype(int))
-
-        self.grid_data = new_grid
-        self.last_tick = perf_counter()
-
-    def draw_gens_counter(self, canvas):
-        gens_str = f"gen: {self.generation}"
+            command = commands.get_nowait()
+            if self.worker is not None:
+                self.worker.submit(command)
+            elif self.replayed is None:
+                self.simulation.run_command(command)
+            # else the recorded frames show what it did
+
+    def next_frame(self, settings: Settings) -> LifeFrame:
+        """The newest generation, switching rule and engine in place if
+        there's no worker to do it"""
+        if self.replayed is not None:
+            return self.replayed
+
+        worker = self.worker
+        if worker is None:
+            self.simulation.apply(settings)
+            return self.simulation.frame()
+
+        worker.update(settings)
+        if worker.ident is None:
+            worker.start()
+        return worker.latest
+
+    def draw_gens_counter(self, canvas, generation: int):
+        gens_str = f"gen: {generation}"
         font = FONT_4X6
         char_width = 4
         padding = 2
         width = len(gens_str) * char_width + padding * 2
         height = font.height + padding * 2
-        img = Image.new("RGB", (width, height), BLACK.rgb)
-        canvas.SetImage(img)
+        canvas.fill_rect(0, 0, width - 1, height - 1, BLACK.rgb)
         DrawText(canvas, font, padding, font.height, ROYALBLUE, gens_str)
 
     async def draw(self, canvas, data: Data):
+        self.check_worker()
         await self.handle_commands(data.game_of_life_commands)
+        settings = self.get_settings(data)
+        frame = self.next_frame(settings)
+        self.drawn = frame
 
-        img = Image.fromarray(np.uint8(self.get_display_grid()))
-        canvas.SetImage(img, -GRID_MARGIN, -GRID_MARGIN)
+        canvas.SetImage(frame.pixels, 0, 0)
 
         if data.game_of_life_show_gens:
-            self.draw_gens_counter(canvas)
+            self.draw_gens_counter(canvas, frame.generation)
 
-        data.game_of_life_generations = self.generation
-        data.game_of_life_cells = self.alive_cells
+        data.game_of_life_generations = frame.generation
+        data.game_of_life_cells = frame.population
+        data.game_of_life_period = frame.period
+        data.game_of_life_period_generation = frame.period_generation
 
-        if perf_counter() - self.last_tick >= data.game_of_life_seconds_per_tick:
-            self.tick()
+        if self.worker is None and self.replayed is None:
+            self.simulation.advance(settings)
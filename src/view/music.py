@@ -47,6 +47,13 @@ class Music(View):
             speed=0.04,
         )
 
+    def get_state(self):
+        return (self.title_scroll.get_state(), self.artist_scroll.get_state())
+
+    def set_state(self, state) -> None:
+        self.title_scroll.set_state(state[0])
+        self.artist_scroll.set_state(state[1])
+
     async def draw(self, canvas, data: Data):
         title = data.title
         artists = data.artists
@@ -4,6 +4,11 @@ from view.viewbase import View, register
 @register
 class Off(View):
     sort = 0
+    max_fps = 1.0
+    idle_fps = 1.0
+
+    def content_key(self, data):
+        return ()
 
     async def draw(self, canvas, data):
         pass
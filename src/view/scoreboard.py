@@ -3,8 +3,8 @@ import logging
 from math import floor
 
 import asyncio
+import numpy as np
 from PIL import Image, ImageDraw
-from rgbmatrix.graphics import DrawLine, DrawText
 import requests
 
 from constants import (
@@ -27,16 +27,20 @@ from constants import (
 from constants.colors import BLACK, WHITE, GRAY
 from constants.fonts import FONT_5X8, FONT_8X13, FONT_10X20, MonoFont
 from data import Data
+from framebuffer import DrawLine, DrawText
 from scrollingtext import ScrollingText
 
 from view.viewbase import View, register
 
 logger = logging.getLogger(__name__)
 
+OUT_RADIUS = 3
+
 
 @register
 class Scoreboard(View):
     sort = 4
+    max_fps = 50.0  # last play scroll moves a pixel every 0.02s
 
     def __init__(self) -> None:
         super().__init__()
@@ -55,6 +59,36 @@ class Scoreboard(View):
 
         self.cached_bases: dict[str, Image.Image] = {}
         self.cached_logos: dict[str, Image.Image] = {}
+        # keep redrawing until every logo has downloaded
+        self.logos_missing = False
+        self.out_imgs = {is_out: self.get_out_img(is_out) for is_out in (True, False)}
+
+    def get_state(self):
+        # downloaded logos too, a replay shouldn't depend on the network
+        return self.play_scroll.get_state(), self.cached_logos
+
+    def set_state(self, state) -> None:
+        scroll, logos = state
+        self.play_scroll.set_state(scroll)
+        self.cached_logos.update(logos)
+
+    def get_out_img(self, is_out: bool) -> np.ndarray:
+        out_size = OUT_RADIUS * 2
+        out = Image.new("RGB", (out_size, out_size))
+        draw = ImageDraw.Draw(out)
+        fill = WHITE.rgb if is_out else BLACK.rgb
+        draw.ellipse((0, 0, out_size - 1, out_size - 1), fill=fill, outline=WHITE.rgb)
+        return np.asarray(out)
+
+    def is_idle(self, data: Data) -> bool:
+        game = data.selected_game
+        # only live games have the last play scrolling
+        return not game or game.get("state", "").upper() != IN
+
+    def content_key(self, data: Data):
+        if not self.is_idle(data) or self.logos_missing:
+            return None
+        return (data.selected_game,)
 
     async def get_logo(self, url: str, size: tuple) -> Image.Image:
         url = url.lower()
@@ -137,6 +171,7 @@ class Scoreboard(View):
         DrawText(canvas, font, x, y, color, clock)
 
     async def draw_logos(self, canvas, data: Data, logo_y: int):
+        self.logos_missing = False
         game = data.selected_game
         league = game.get("league")
         team_abbr = game.get("team_abbr")
@@ -150,6 +185,7 @@ class Scoreboard(View):
 
         team_img = await self.get_logo(team_url, logo_size)
         if not team_img:
+            self.logos_missing = True
             return
 
         team_img_x = self.get_logo_x(team_homeaway)
@@ -159,6 +195,7 @@ class Scoreboard(View):
             oppo_url = f"{LOGO_URL}/{league}/500-dark/scoreboard/{oppo_abbr}.png"
             oppo_img = await self.get_logo(oppo_url, logo_size)
             if not oppo_img:
+                self.logos_missing = True
                 return
             oppo_img_x = self.get_logo_x(oppo_homeaway)
             canvas.SetImage(oppo_img, oppo_img_x, logo_y)
@@ -166,6 +203,7 @@ class Scoreboard(View):
             league_url = game.get("league_logo")
             league_img = await self.get_logo(league_url, logo_size)
             if not league_img:
+                self.logos_missing = True
                 return
             league_img_x = self.get_logo_x(AWAY)
             canvas.SetImage(league_img, league_img_x, logo_y)
@@ -243,22 +281,13 @@ class Scoreboard(View):
         DrawText(canvas, font, x, y, color, count)
 
         MAX_OUTS = 3
-        radius = 3
         out_space = 2
         x = PANEL_WIDTH + out_space
-        y = count_y + radius
+        y = count_y + OUT_RADIUS
         for o in range(MAX_OUTS):
-            out_size = radius * 2
-            out = Image.new("RGB", (out_size, out_size))
-            draw = ImageDraw.Draw(out)
-            fill = BLACK.rgb
-            if outs >= o + 1:
-                fill = WHITE.rgb
-            draw.ellipse(
-                (0, 0, out_size - 1, out_size - 1), fill=fill, outline=WHITE.rgb
-            )
+            out = self.out_imgs[outs >= o + 1]
             canvas.SetImage(out, x, y)
-            x += out.width + out_space
+            x += out.shape[1] + out_space
 
     def draw_down_distance_yard(
         self, canvas, down_distance: str, font: MonoFont, color, y: int = 37
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 import functools
 import os
 import sys
+from typing import Hashable
 
 file_path = os.path.abspath(__file__)
 root_folder = os.path.abspath(os.path.dirname(os.path.dirname(file_path)))
@@ -9,17 +10,63 @@ sys.path.append(root_folder)
 
 import logging
 
+from constants import IDLE_FPS, TARGET_FPS
+
 logger = logging.getLogger(__name__)
 
 
 class View(ABC):
     name: str = None
     sort: int = None
+    # fastest the view is worth drawing, and how fast to draw while idle
+    max_fps: float = TARGET_FPS
+    idle_fps: float = IDLE_FPS
 
     @abstractmethod
     async def draw(self, canvas, data):
         pass
 
+    def is_idle(self, data) -> bool:
+        """True when nothing on screen is animating"""
+        return False
+
+    def frame_interval(self, data) -> float:
+        fps = self.idle_fps if self.is_idle(data) else self.max_fps
+        return 1.0 / fps
+
+    def content_key(self, data) -> Hashable:
+        """Everything the next frame depends on, or None if it must be redrawn.
+
+        If the key is equal to the one from the frame on the panel, the frame
+        is reused instead of being drawn again.
+        """
+        return None
+
+    def get_state(self):
+        """What the view's frames depend on besides Data and the clock, for a
+        recording to start the view from. None if there's nothing.
+
+        It's pickled as soon as it's taken, so it can be the view's own
+        objects rather than copies of them.
+        """
+        return None
+
+    def set_state(self, state) -> None:
+        """Pick up from the get_state() of the view a recording was made with"""
+        pass
+
+    def get_input(self):
+        """What the frame just drawn took from another thread, recorded with
+        the frame for set_input() on replay. None if it drew from Data and
+        its own state alone.
+        """
+        return None
+
+    def set_input(self, value) -> None:
+        """Draw the next frame from a recorded get_input() instead of taking
+        it from another thread"""
+        pass
+
     def load(self):
         logger.debug(f"{self.__class__.__name__} Load")
 
@@ -2,7 +2,6 @@ from datetime import datetime
 from math import floor
 
 from PIL import Image, ImageDraw
-from rgbmatrix.graphics import DrawText
 
 from constants import (
     PANEL_HEIGHT,
@@ -29,6 +28,7 @@ from constants.colors import BLACK, CRIMSON, WHITE
 from constants.fonts import FONT_4X6, FONT_5X8, FONT_8X13, FONT_9X18, FONT_10X20
 from constants.secondaryinfo import POP, RH, SECONDARY_DEFAULT, SecondaryInfo
 from data import Data
+from framebuffer import DrawText, FrameBuffer
 from scrollingtext import ScrollingText
 from view.viewbase import View, register
 
@@ -36,6 +36,7 @@ from view.viewbase import View, register
 @register
 class Weather(View):
     sort = 1
+    max_fps = 50.0  # alert scrolls move a pixel every 0.02s
 
     def __init__(self) -> None:
         super().__init__()
@@ -63,6 +64,29 @@ class Weather(View):
         )
 
         self.cached_conditions: dict[str, Image.Image] = {}
+        # everything but the alert scrollers, redrawn when the key changes
+        self.static_frame: FrameBuffer = None
+        self.static_key: tuple = None
+
+    def is_idle(self, data: Data) -> bool:
+        weather = data.weather_forecast
+        if not weather or data.forecast_type != ALERT:
+            return True
+
+        alert = weather.get("alert")
+        return not alert or alert["total"] == 0
+
+    def content_key(self, data: Data):
+        if not self.is_idle(data):
+            return None
+        return (data.weather_forecast, data.forecast_type, data.secondary_type)
+
+    def get_state(self):
+        return (self.alert_title_scroll.get_state(), self.alert_scroll.get_state())
+
+    def set_state(self, state) -> None:
+        self.alert_title_scroll.set_state(state[0])
+        self.alert_scroll.set_state(state[1])
 
     def get_condition_img(self, condition: str, size: int) -> Image.Image:
         if condition not in CONDITION:
@@ -254,39 +278,46 @@ class Weather(View):
         info_y = img_y + condition_img.height + FONT_4X6.height + 1
         DrawText(canvas, FONT_4X6, info_x, info_y, WHITE, info)
 
-    def draw_alert(self, canvas, alert):
-        if alert["total"] > 0:
-            self.alert_title_scroll.draw(canvas, alert["title"])
+    def draw_alert_expires(self, canvas, alert):
+        if alert["total"] == 0:
+            return
 
-            expire_date = datetime.fromisoformat(alert["event_expires"])
-            expire_x = 2
-            expire_y = PANEL_HEIGHT - 4 - FONT_5X8.height
-            expire_txt = f"Expires: {expire_date.strftime('%x %I:%M %p')}"
-            if alert["total"] > 1:
-                count = f"({alert['selected']}/{alert['total']})"
-                expire_txt = f"{expire_txt} {count}"
+        expire_date = datetime.fromisoformat(alert["event_expires"])
+        expire_x = 2
+        expire_y = PANEL_HEIGHT - 4 - FONT_5X8.height
+        expire_txt = f"Expires: {expire_date.strftime('%x %I:%M %p')}"
+        if alert["total"] > 1:
+            count = f"({alert['selected']}/{alert['total']})"
+            expire_txt = f"{expire_txt} {count}"
 
-            DrawText(canvas, FONT_4X6, expire_x, expire_y, WHITE, expire_txt)
+        DrawText(canvas, FONT_4X6, expire_x, expire_y, WHITE, expire_txt)
 
+    def draw_alert(self, canvas, alert):
+        if alert["total"] > 0:
+            self.alert_title_scroll.draw(canvas, alert["title"])
             self.alert_scroll.draw(canvas, alert["spoken_desc"])
         else:
             self.alert_title_scroll.draw(canvas, "No active alerts")
             self.alert_scroll.draw(canvas, "")
 
-    async def draw(self, canvas, data: Data):
-        weather = data.weather_forecast
-
-        if not weather:
-            return
+    def is_static_current(self, weather, forecast_type, secondary_type) -> bool:
+        if self.static_key is None:
+            return False
 
-        forecast_type = data.forecast_type
-        secondary_type = data.secondary_type
+        cached_weather, cached_forecast_type, cached_secondary_type = self.static_key
+        # payloads are replaced when they arrive, never changed in place
+        return (
+            cached_weather is weather
+            and cached_forecast_type == forecast_type
+            and cached_secondary_type == secondary_type
+        )
 
+    def draw_static(self, canvas, weather, forecast_type, secondary_type):
         self.draw_current_weather(canvas, weather, secondary_type)
 
         alert = weather.get("alert")
         if forecast_type == ALERT and alert:
-            self.draw_alert(canvas, alert)
+            self.draw_alert_expires(canvas, alert)
             return
 
         forecasts = weather.get(f"forecast_{forecast_type.lower()}")
@@ -300,3 +331,25 @@ class Weather(View):
                 canvas, x, y, f_width, forecast, forecast_type, secondary_type
             )
             x += f_width
+
+    async def draw(self, canvas, data: Data):
+        weather = data.weather_forecast
+
+        if not weather:
+            return
+
+        forecast_type = data.forecast_type
+        secondary_type = data.secondary_type
+
+        if not self.is_static_current(weather, forecast_type, secondary_type):
+            if self.static_frame is None:
+                self.static_frame = FrameBuffer(canvas.width, canvas.height)
+            self.static_frame.Clear()
+            self.draw_static(self.static_frame, weather, forecast_type, secondary_type)
+            self.static_key = (weather, forecast_type, secondary_type)
+
+        canvas.blit(self.static_frame.pixels)
+
+        alert = weather.get("alert")
+        if forecast_type == ALERT and alert:
+            self.draw_alert(canvas, alert)